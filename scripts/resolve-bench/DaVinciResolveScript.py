@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for DaVinci Resolve's DaVinciResolveScript module
+Simulates a project with one timeline, a media pool and render jobs, so resolve_api.py
+can be exercised and benchmarked without a running Resolve. Put this directory first
+on PYTHONPATH. Every scripting call sleeps for a configurable RPC latency, and render
+jobs progress at a configurable speed and write dummy output files.
+
+Settings come from environment variables (so a spawned resolve_api.py picks them up)
+and can be changed in-process with configure():
+
+    FAKE_RESOLVE_LATENCY_MS         per-call latency (default 0.5)
+    FAKE_RESOLVE_RENDER_FPS         frames rendered per second (default 2400)
+    FAKE_RESOLVE_BYTES_PER_FRAME    dummy output size per frame (default 1024)
+    FAKE_RESOLVE_FPS                timeline frame rate setting (default "24")
+    FAKE_RESOLVE_TIMELINE_FRAMES    timeline length (default 2400)
+    FAKE_RESOLVE_POOL_CLIPS         clips already in the media pool (default 100)
+    FAKE_RESOLVE_POOL_BINS          bins the pool clips are spread over (default 10)
+    FAKE_RESOLVE_SOURCE_PATH        source file of the clips on the timeline
+"""
+
+import os
+import time
+import uuid
+
+CONFIG = {
+    'latencyMs': float(os.environ.get('FAKE_RESOLVE_LATENCY_MS', '0.5')),
+    'renderFps': float(os.environ.get('FAKE_RESOLVE_RENDER_FPS', '2400')),
+    'bytesPerFrame': int(os.environ.get('FAKE_RESOLVE_BYTES_PER_FRAME', '1024')),
+    'fps': os.environ.get('FAKE_RESOLVE_FPS', '24'),
+    'timelineFrames': int(os.environ.get('FAKE_RESOLVE_TIMELINE_FRAMES', '2400')),
+    'poolClips': int(os.environ.get('FAKE_RESOLVE_POOL_CLIPS', '100')),
+    'poolBins': int(os.environ.get('FAKE_RESOLVE_POOL_BINS', '10')),
+    'sourcePath': os.environ.get('FAKE_RESOLVE_SOURCE_PATH', '/media/benchmark/source.mov'),
+}
+
+# Scripting calls made so far, by method name
+CALLS = {}
+
+_resolve = None
+
+
+def configure(**overrides):
+    """Change settings (keys as in CONFIG) and rebuild the simulated session"""
+    CONFIG.update(overrides)
+    reset()
+
+
+def reset():
+    """Start a fresh simulated session (new project, timeline, pool and render queue)"""
+    global _resolve
+    CALLS.clear()
+    _resolve = Resolve()
+
+
+def _rpc(name):
+    CALLS[name] = CALLS.get(name, 0) + 1
+    latency = CONFIG['latencyMs']
+    if latency > 0:
+        time.sleep(latency / 1000)
+
+
+def scriptapp(name):
+    if name != 'Resolve':
+        return None
+    if _resolve is None:
+        reset()
+    return _resolve
+
+
+class Resolve:
+    def __init__(self):
+        self._project_manager = ProjectManager()
+
+    def GetProjectManager(self):
+        _rpc('GetProjectManager')
+        return self._project_manager
+
+    def GetProductName(self):
+        _rpc('GetProductName')
+        return 'DaVinci Resolve (offline stand-in)'
+
+    def GetVersionString(self):
+        _rpc('GetVersionString')
+        return '19.0.0.0'
+
+
+class ProjectManager:
+    def __init__(self):
+        self._project = Project('Benchmark Project')
+
+    def GetCurrentProject(self):
+        _rpc('GetCurrentProject')
+        return self._project
+
+
+class Project:
+    def __init__(self, name):
+        self._name = name
+        self._id = uuid.uuid4().hex
+        self._settings = {
+            'timelineFrameRate': str(CONFIG['fps']),
+            'timelineResolutionWidth': '1920',
+            'timelineResolutionHeight': '1080',
+            'timelineDropFrameTimecode': '0',
+        }
+        self._media_pool = MediaPool()
+        self._timeline = Timeline(self, 'Timeline 1', self._media_pool)
+        self._render_settings = {}
+        self._format = ('mp4', 'H264')
+        self._jobs = {}
+        self._presets = {}
+
+    def GetName(self):
+        _rpc('GetName')
+        return self._name
+
+    def GetUniqueId(self):
+        _rpc('GetUniqueId')
+        return self._id
+
+    def GetSetting(self, name=None):
+        _rpc('GetSetting')
+        if name is None:
+            return dict(self._settings)
+        return self._settings.get(name, '')
+
+    def SetSetting(self, name, value):
+        _rpc('SetSetting')
+        self._settings[name] = str(value)
+        return True
+
+    def GetMediaPool(self):
+        _rpc('GetMediaPool')
+        return self._media_pool
+
+    def GetTimelineCount(self):
+        _rpc('GetTimelineCount')
+        return 1
+
+    def GetCurrentTimeline(self):
+        _rpc('GetCurrentTimeline')
+        return self._timeline
+
+    # Render settings and queue
+
+    def SetRenderSettings(self, settings):
+        _rpc('SetRenderSettings')
+        self._render_settings.update(settings)
+        return True
+
+    def SetCurrentRenderFormatAndCodec(self, format_name, codec):
+        _rpc('SetCurrentRenderFormatAndCodec')
+        self._format = (format_name, codec)
+        return True
+
+    def GetCurrentRenderFormatAndCodec(self):
+        _rpc('GetCurrentRenderFormatAndCodec')
+        return {'format': self._format[0], 'codec': self._format[1]}
+
+    def LoadRenderPreset(self, name):
+        _rpc('LoadRenderPreset')
+        preset = self._presets.get(name)
+        if not preset:
+            return False
+        self._render_settings = dict(preset['settings'])
+        self._format = preset['format']
+        return True
+
+    def SaveAsNewRenderPreset(self, name):
+        _rpc('SaveAsNewRenderPreset')
+        if name in self._presets:
+            return False
+        self._presets[name] = {'settings': dict(self._render_settings), 'format': self._format}
+        return True
+
+    def DeleteRenderPreset(self, name):
+        _rpc('DeleteRenderPreset')
+        return self._presets.pop(name, None) is not None
+
+    def GetRenderPresetList(self):
+        _rpc('GetRenderPresetList')
+        return list(self._presets)
+
+    def AddRenderJob(self):
+        _rpc('AddRenderJob')
+        settings = self._render_settings
+        if not settings.get('TargetDir'):
+            return ''
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = RenderJob(job_id, dict(settings), self._format, self._timeline)
+        return job_id
+
+    def DeleteRenderJob(self, job_id):
+        _rpc('DeleteRenderJob')
+        job = self._jobs.get(job_id)
+        if not job or job.status() == 'Rendering':
+            return False
+        del self._jobs[job_id]
+        return True
+
+    def DeleteAllRenderJobs(self):
+        _rpc('DeleteAllRenderJobs')
+        self._jobs.clear()
+        return True
+
+    def GetRenderJobList(self):
+        _rpc('GetRenderJobList')
+        return [job.info() for job in self._jobs.values()]
+
+    def StartRendering(self, *job_ids, **kwargs):
+        _rpc('StartRendering')
+        if len(job_ids) == 1 and isinstance(job_ids[0], list):
+            job_ids = job_ids[0]
+        jobs = [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs] if job_ids else list(self._jobs.values())
+        # Jobs render one after another, like the render queue
+        start = time.monotonic()
+        for job in jobs:
+            if job.started is None:
+                job.started = start
+                start += job.duration()
+        return bool(jobs)
+
+    def StopRendering(self):
+        _rpc('StopRendering')
+        for job in self._jobs.values():
+            if job.status() in ('Rendering', 'Ready') and job.started is not None:
+                job.cancelled = True
+
+    def IsRenderingInProgress(self):
+        _rpc('IsRenderingInProgress')
+        return any(job.status() == 'Rendering' for job in self._jobs.values())
+
+    def GetRenderJobStatus(self, job_id):
+        _rpc('GetRenderJobStatus')
+        job = self._jobs.get(job_id)
+        return job.status_info() if job else {}
+
+
+class RenderJob:
+    def __init__(self, job_id, settings, render_format, timeline):
+        self.job_id = job_id
+        self.settings = settings
+        self.format = render_format
+        self.mark_in = int(settings.get('MarkIn', timeline._start))
+        self.mark_out = int(settings.get('MarkOut', timeline._start + timeline._frames - 1))
+        self.started = None
+        self.cancelled = False
+        self.written = False
+
+    def frames(self):
+        return max(1, self.mark_out - self.mark_in + 1)
+
+    def duration(self):
+        return self.frames() / max(CONFIG['renderFps'], 1e-6)
+
+    def output_name(self):
+        # Like Resolve, the container follows the render format even for audio-only jobs
+        return f"{self.settings.get('CustomName') or self.job_id}.{self.format[0]}"
+
+    def progress(self):
+        if self.started is None:
+            return 0.0
+        return min(1.0, max(0.0, (time.monotonic() - self.started) / self.duration()))
+
+    def status(self):
+        if self.cancelled:
+            return 'Cancelled'
+        if self.started is None or time.monotonic() < self.started:
+            return 'Ready'
+        if self.progress() < 1.0:
+            return 'Rendering'
+        self._write_output()
+        return 'Complete'
+
+    def status_info(self):
+        status = self.status()
+        info = {'JobStatus': status, 'CompletionPercentage': int(self.progress() * 100)}
+        if status == 'Rendering':
+            info['EstimatedTimeRemainingInMs'] = int((1.0 - self.progress()) * self.duration() * 1000)
+        if status == 'Complete':
+            info['TimeTakenToRenderInMs'] = int(self.duration() * 1000)
+        return info
+
+    def info(self):
+        return {
+            'JobId': self.job_id,
+            'RenderJobName': self.settings.get('CustomName', ''),
+            'TargetDir': self.settings.get('TargetDir', ''),
+            'OutputFilename': self.output_name(),
+            'MarkIn': self.mark_in,
+            'MarkOut': self.mark_out,
+        }
+
+    def _write_output(self):
+        if self.written:
+            return
+        self.written = True
+        target_dir = self.settings.get('TargetDir')
+        if not target_dir:
+            return
+        os.makedirs(target_dir, exist_ok=True)
+        size = self.frames() * CONFIG['bytesPerFrame']
+        with open(os.path.join(target_dir, self.output_name()), 'wb') as f:
+            f.truncate(size)
+
+
+class Timeline:
+    def __init__(self, project, name, media_pool):
+        self._project = project
+        self._name = name
+        self._id = uuid.uuid4().hex
+        self._start = 86400
+        self._frames = CONFIG['timelineFrames']
+        self._playhead = self._start
+        self._marks = {}
+        self._markers = {0: {'color': 'Blue', 'duration': 1, 'name': 'Intro', 'note': '', 'customData': ''}}
+        # One clip per video and audio track covering the whole timeline
+        source = MediaPoolItem(CONFIG['sourcePath'], self._frames)
+        media_pool._root._clips.append(source)
+        self._tracks = {
+            'video': [[TimelineItem(source, self._start, self._frames, 'video')]],
+            'audio': [[TimelineItem(source, self._start, self._frames, 'audio')]],
+            'subtitle': [],
+        }
+
+    def GetName(self):
+        _rpc('GetName')
+        return self._name
+
+    def GetUniqueId(self):
+        _rpc('GetUniqueId')
+        return self._id
+
+    def GetStartFrame(self):
+        _rpc('GetStartFrame')
+        return self._start
+
+    def GetEndFrame(self):
+        _rpc('GetEndFrame')
+        return self._start + self._frames - 1
+
+    def GetMarkInOut(self):
+        _rpc('GetMarkInOut')
+        return {kind: dict(marks) for kind, marks in self._marks.items()}
+
+    def SetMarkInOut(self, mark_in, mark_out, kind='all'):
+        _rpc('SetMarkInOut')
+        for track_type in (('video', 'audio') if kind == 'all' else (kind,)):
+            self._marks[track_type] = {'in': mark_in, 'out': mark_out}
+        return True
+
+    def GetMarkers(self):
+        _rpc('GetMarkers')
+        return {frame: dict(marker) for frame, marker in self._markers.items()}
+
+    def AddMarker(self, frame, color, name, note, duration, custom_data=''):
+        _rpc('AddMarker')
+        self._markers[frame] = {'color': color, 'name': name, 'note': note, 'duration': duration, 'customData': custom_data}
+        return True
+
+    def GetCurrentTimecode(self):
+        _rpc('GetCurrentTimecode')
+        fps = int(round(float(self._project._settings['timelineFrameRate'])))
+        frame = self._playhead
+        return '%02d:%02d:%02d:%02d' % (frame // (fps * 3600), frame // (fps * 60) % 60, frame // fps % 60, frame % fps)
+
+    def GetTrackCount(self, track_type):
+        _rpc('GetTrackCount')
+        return len(self._tracks.get(track_type, []))
+
+    def GetIsTrackEnabled(self, track_type, index):
+        _rpc('GetIsTrackEnabled')
+        return True
+
+    def GetItemListInTrack(self, track_type, index):
+        _rpc('GetItemListInTrack')
+        tracks = self._tracks.get(track_type, [])
+        return list(tracks[index - 1]) if 0 < index <= len(tracks) else None
+
+    def _add_item(self, item, track_type, index):
+        tracks = self._tracks.setdefault(track_type, [])
+        while len(tracks) < index:
+            tracks.append([])
+        tracks[index - 1].append(item)
+
+
+class TimelineItem:
+    def __init__(self, media_item, start, duration, track_type, left_offset=0):
+        self._media_item = media_item
+        self._start = start
+        self._duration = duration
+        self._track_type = track_type
+        self._left_offset = left_offset
+        self._properties = {'Pan': 0.0, 'Tilt': 0.0, 'ZoomX': 1.0, 'ZoomY': 1.0, 'RotationAngle': 0.0, 'Opacity': 100.0}
+
+    def GetName(self):
+        _rpc('GetName')
+        return self._media_item._name
+
+    def GetStart(self):
+        _rpc('GetStart')
+        return self._start
+
+    def GetEnd(self):
+        _rpc('GetEnd')
+        return self._start + self._duration
+
+    def GetDuration(self):
+        _rpc('GetDuration')
+        return self._duration
+
+    def GetClipEnabled(self):
+        _rpc('GetClipEnabled')
+        return True
+
+    def GetFusionCompCount(self):
+        _rpc('GetFusionCompCount')
+        return 0
+
+    def GetNumNodes(self):
+        _rpc('GetNumNodes')
+        return 1
+
+    def GetLeftOffset(self):
+        _rpc('GetLeftOffset')
+        return self._left_offset
+
+    def GetRightOffset(self):
+        _rpc('GetRightOffset')
+        return max(0, self._media_item._frames - self._left_offset - self._duration)
+
+    def GetMediaPoolItem(self):
+        _rpc('GetMediaPoolItem')
+        return self._media_item
+
+    def GetProperty(self, key=None):
+        _rpc('GetProperty')
+        return dict(self._properties) if key is None else self._properties.get(key)
+
+    def GetTrackTypeAndIndex(self):
+        _rpc('GetTrackTypeAndIndex')
+        return [self._track_type, 1]
+
+
+class MediaPoolItem:
+    def __init__(self, path, frames=240):
+        self._id = uuid.uuid4().hex
+        self._name = os.path.basename(path)
+        self._frames = frames
+        self._properties = {
+            'File Path': path,
+            'Clip Name': self._name,
+            'Frames': str(frames),
+            'FPS': CONFIG['fps'],
+            'Type': 'Video + Audio',
+            'Video Codec': 'H.264',
+            'Resolution': '1920x1080',
+        }
+
+    def GetName(self):
+        _rpc('GetName')
+        return self._name
+
+    def GetMediaId(self):
+        _rpc('GetMediaId')
+        return self._id
+
+    def GetClipProperty(self, key=None):
+        _rpc('GetClipProperty')
+        return dict(self._properties) if key is None else self._properties.get(key, '')
+
+
+class Folder:
+    def __init__(self, name):
+        self._id = uuid.uuid4().hex
+        self._name = name
+        self._clips = []
+        self._subfolders = []
+
+    def GetName(self):
+        _rpc('GetName')
+        return self._name
+
+    def GetUniqueId(self):
+        _rpc('GetUniqueId')
+        return self._id
+
+    def GetClipList(self):
+        _rpc('GetClipList')
+        return list(self._clips)
+
+    def GetSubFolderList(self):
+        _rpc('GetSubFolderList')
+        return list(self._subfolders)
+
+
+class MediaPool:
+    def __init__(self):
+        self._root = Folder('Master')
+        self._current = self._root
+        # Pre-populate the pool, spread over bins, with files that need not exist
+        bins = [self._root]
+        for index in range(CONFIG['poolBins']):
+            folder = Folder(f'Bin {index + 1}')
+            self._root._subfolders.append(folder)
+            bins.append(folder)
+        for index in range(CONFIG['poolClips']):
+            bins[index % len(bins)]._clips.append(MediaPoolItem(f'/media/pool/clip_{index:06d}.mov'))
+
+    def GetRootFolder(self):
+        _rpc('GetRootFolder')
+        return self._root
+
+    def GetCurrentFolder(self):
+        _rpc('GetCurrentFolder')
+        return self._current
+
+    def SetCurrentFolder(self, folder):
+        _rpc('SetCurrentFolder')
+        self._current = folder
+        return True
+
+    def AddSubFolder(self, parent, name):
+        _rpc('AddSubFolder')
+        folder = Folder(name)
+        parent._subfolders.append(folder)
+        return folder
+
+    def MoveClips(self, clips, target_folder):
+        _rpc('MoveClips')
+        pending = [self._root]
+        while pending:
+            folder = pending.pop()
+            folder._clips = [clip for clip in folder._clips if not any(clip is moved for moved in clips)]
+            pending.extend(folder._subfolders)
+        target_folder._clips.extend(clips)
+        return True
+
+    def ImportMedia(self, paths):
+        _rpc('ImportMedia')
+        # Like Resolve, files that can't be read are skipped
+        clips = [MediaPoolItem(path) for path in paths if os.path.isfile(path)]
+        self._current._clips.extend(clips)
+        return clips
+
+    def AppendToTimeline(self, items):
+        _rpc('AppendToTimeline')
+        timeline = _resolve._project_manager._project._timeline
+        appended = []
+        for item in items:
+            if isinstance(item, dict):
+                clip = item.get('mediaPoolItem')
+                start = int(item.get('startFrame', 0))
+                end = int(item.get('endFrame', clip._frames - 1))
+                record = int(item.get('recordFrame', timeline._start + timeline._frames))
+                track_index = int(item.get('trackIndex', 1))
+                media_type = item.get('mediaType')
+            else:
+                clip, start, end = item, 0, item._frames - 1
+                record, track_index, media_type = timeline._start + timeline._frames, 1, None
+            if not isinstance(clip, MediaPoolItem):
+                return []
+            for track_type in ('video', 'audio'):
+                if media_type in (1, 2) and track_type != ('video' if media_type == 1 else 'audio'):
+                    continue
+                timeline_item = TimelineItem(clip, record, end - start + 1, track_type, start)
+                timeline._add_item(timeline_item, track_type, track_index)
+                appended.append(timeline_item)
+        return appended
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for src/resolve/python/resolve_api.py
+Runs against the DaVinciResolveScript stand-in next to this file, so no Resolve is
+needed, and reports JSON that can be tracked across releases:
+
+    python3 scripts/resolve-bench/bench.py --output resolve-bench.json
+    python3 scripts/resolve-bench/bench.py --only functions,outputLookup --latency-ms 2
+
+Suites:
+    functions     warm in-process latency of every entry in resolve_api.functions
+    coldStart     one-shot CLI call (interpreter start + import + connect)
+    worker        round trip through the --server worker
+    export        end-to-end video/audio exports (uncached, cached, direct source copy)
+    outputLookup  locating a render output in a directory of 10k files
+    mediaPool     import into large media pools (index build, reuse, bulk import)
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(HERE))
+API_DIR = os.path.join(REPO_ROOT, 'src', 'resolve', 'python')
+
+# Bump when the report layout changes incompatibly
+SCHEMA_VERSION = 1
+
+SUITES = ('functions', 'coldStart', 'worker', 'export', 'outputLookup', 'mediaPool')
+
+# Functions that can't run unattended
+SKIPPED_FUNCTIONS = {'revealFile': 'opens the system file browser'}
+
+fake = None
+api = None
+
+
+def log(message):
+    print(message, file=sys.stderr)
+
+
+def stats(samples_ms):
+    """Summarize a list of millisecond samples"""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {'n': 0}
+    return {
+        'n': len(ordered),
+        'minMs': round(ordered[0], 3),
+        'medianMs': round(statistics.median(ordered), 3),
+        'p95Ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'maxMs': round(ordered[-1], 3),
+        'meanMs': round(statistics.fmean(ordered), 3),
+    }
+
+
+def new_session(**config):
+    """Start a fresh simulated Resolve session and drop resolve_api's cached handles"""
+    fake.configure(**config)
+    api._drop_connection()
+    api._resolve_last_attempt = None
+
+
+def call(func_name, payload):
+    """Call one function in-process; returns (elapsed ms, rpc count, parsed response)"""
+    calls_before = sum(fake.CALLS.values())
+    start = time.perf_counter()
+    result = api._call_function(func_name, dict(payload, timings=True))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return elapsed_ms, sum(fake.CALLS.values()) - calls_before, json.loads(result)
+
+
+def measure(func_name, payload, iterations, before_each=None):
+    """Run a function several times and summarize latency, RPC count and outcome"""
+    samples = []
+    rpc_counts = []
+    response = {}
+    for _ in range(iterations):
+        if before_each:
+            before_each()
+        elapsed_ms, rpc_count, response = call(func_name, payload)
+        samples.append(elapsed_ms)
+        rpc_counts.append(rpc_count)
+    entry = stats(samples)
+    entry['rpcCalls'] = int(statistics.median(rpc_counts)) if rpc_counts else 0
+    entry['ok'] = bool(response.get('ok'))
+    if not response.get('ok') and response.get('error'):
+        entry['error'] = response['error']
+    timings = response.get('timings') or {}
+    if timings.get('phases'):
+        entry['phases'] = {name: phase['ms'] for name, phase in timings['phases'].items()}
+    return entry
+
+
+def make_media(work_dir, count, prefix='bench'):
+    """Create small dummy media files to import"""
+    media_dir = os.path.join(work_dir, 'media')
+    os.makedirs(media_dir, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = os.path.join(media_dir, f'{prefix}_{index:05d}.mov')
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        paths.append(path)
+    return paths
+
+
+def make_wav(work_dir, seconds, rate=48000):
+    """Write a silent 16-bit stereo WAV"""
+    import wave
+    path = os.path.join(work_dir, 'media', 'source.wav')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with wave.open(path, 'wb') as output:
+        output.setnchannels(2)
+        output.setsampwidth(2)
+        output.setframerate(rate)
+        output.writeframes(b'\0' * (int(seconds * rate) * 4))
+    return path
+
+
+def function_payloads(media_file):
+    return {
+        'exportInOutVideo': {'codec': 'h264', 'cache': False},
+        'exportInOutAudio': {'format': 'wav', 'cache': False},
+        'exportInOutBatch': {'codec': 'h264', 'markerColor': 'Blue'},
+        'exportInOutCombined': {'codec': 'h264', 'format': 'wav'},
+        'exportInOutSegmented': {'codec': 'h264', 'segmentSeconds': 5},
+        'insertFileAtPlayhead': {'path': media_file},
+        'importFileToBin': {'path': media_file, 'binName': 'sync/bench'},
+        'importFilesToBins': {'files': [{'path': media_file}], 'binName': 'sync/bench'},
+        'getProjectDir': {},
+        'getTimelineState': {},
+        'diagInOut': {},
+        'cancelRender': {},
+        'recordUpload': {'path': media_file, 'url': 'https://uploads.invalid/bench.mov'},
+    }
+
+
+def bench_functions(args, work_dir):
+    new_session()
+    media_file = make_media(work_dir, 1, 'function')[0]
+    payloads = function_payloads(media_file)
+    results = {}
+    for func_name in api.functions:
+        if func_name in SKIPPED_FUNCTIONS:
+            results[func_name] = {'skipped': SKIPPED_FUNCTIONS[func_name]}
+            continue
+        renders = func_name.startswith('export')
+        iterations = args.export_iterations if renders else args.iterations
+        log(f'  {func_name} x{iterations}')
+        entry = measure(func_name, payloads.get(func_name, {}), iterations)
+        if func_name not in payloads:
+            entry['note'] = 'no benchmark payload; called with {}'
+        results[func_name] = entry
+    return results
+
+
+def bench_cold_start(args, work_dir, env):
+    samples = []
+    script = os.path.join(API_DIR, 'resolve_api.py')
+    for _ in range(args.cold_iterations):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script, 'getTimelineState', '{}'], env=env, cwd=API_DIR,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'getTimelineState': stats(samples)}
+
+
+def bench_worker(args, work_dir, env):
+    script = os.path.join(API_DIR, 'resolve_api.py')
+    worker = subprocess.Popen([sys.executable, '-u', script, '--server'], env=env, cwd=API_DIR,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    results = {}
+    try:
+        request_id = 0
+        for func_name, payload in (('ping', {}), ('getTimelineState', {}), ('getProjectDir', {})):
+            samples = []
+            # The first call pays the connection; report it separately
+            for iteration in range(args.iterations + 1):
+                request_id += 1
+                start = time.perf_counter()
+                worker.stdin.write(json.dumps({'id': request_id, 'fn': func_name, 'payload': payload}) + '\n')
+                worker.stdin.flush()
+                while True:
+                    message = json.loads(worker.stdout.readline())
+                    if message.get('id') == request_id and 'result' in message:
+                        break
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if iteration == 0:
+                    first_ms = elapsed_ms
+                else:
+                    samples.append(elapsed_ms)
+            results[func_name] = dict(stats(samples), firstMs=round(first_ms, 3))
+        worker.stdin.write(json.dumps({'id': 0, 'fn': 'shutdown'}) + '\n')
+        worker.stdin.flush()
+        worker.wait(timeout=10)
+    finally:
+        if worker.poll() is None:
+            worker.kill()
+    return results
+
+
+def bench_export(args, work_dir):
+    new_session()
+    results = {
+        'videoH264': measure('exportInOutVideo', {'codec': 'h264', 'cache': False}, args.export_iterations),
+        'videoUpload': measure('exportInOutVideo', {'codec': 'upload', 'cache': False}, args.export_iterations),
+        'audioWav': measure('exportInOutAudio', {'format': 'wav', 'cache': False}, args.export_iterations),
+    }
+    # Prime the render cache, then time hits
+    call('exportInOutVideo', {'codec': 'h264'})
+    results['videoCached'] = measure('exportInOutVideo', {'codec': 'h264'}, args.iterations)
+
+    # A timeline made of one clip whose source WAV is on disk takes the direct copy path
+    new_session(sourcePath=make_wav(work_dir, args.timeline_frames / 24.0 + 1))
+    results['audioDirectWav'] = measure('exportInOutAudio', {'format': 'wav', 'cache': False}, args.iterations)
+    return results
+
+
+def bench_output_lookup(args, work_dir):
+    new_session()
+    project = api._get_project()
+    output_dir = os.path.join(work_dir, 'lookup')
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+    base_time = 1700000000000
+    for index in range(args.output_files):
+        with open(os.path.join(output_dir, f'sync_export_{base_time + index}.mp4'), 'wb'):
+            pass
+    # A render whose file got a suffix from Resolve, so only the index or a scan finds it
+    suffixed_base = f'sync_export_{base_time + args.output_files}'
+    with open(os.path.join(output_dir, f'{suffixed_base}_1.mp4'), 'wb'):
+        pass
+    index_path = api._store_path(output_dir, 'outputs')
+
+    def lookup(base_name):
+        start = time.perf_counter()
+        found = api._find_render_output(project, None, output_dir, base_name, ['mp4'])
+        return (time.perf_counter() - start) * 1000, found
+
+    def run(base_name, clear_index):
+        samples = []
+        found = None
+        for _ in range(args.iterations):
+            if clear_index and os.path.exists(index_path):
+                os.remove(index_path)
+            elapsed_ms, found = lookup(base_name)
+            samples.append(elapsed_ms)
+        return dict(stats(samples), found=found is not None)
+
+    results = {
+        'files': args.output_files + 1,
+        'direct': run(f'sync_export_{base_time + args.output_files // 2}', False),
+        'suffixedScan': run(suffixed_base, True),
+    }
+    lookup(suffixed_base)
+    results['suffixedIndexed'] = run(suffixed_base, False)
+    results['miss'] = run('sync_export_missing', False)
+    return results
+
+
+def bench_media_pool(args, work_dir):
+    results = {}
+    for pool_size in args.pool_sizes:
+        log(f'  pool of {pool_size} clips')
+        new_session(poolClips=pool_size, poolBins=max(1, pool_size // 500))
+        media = make_media(work_dir, args.bulk_files + args.iterations + 1, f'pool{pool_size}')
+        entry = {
+            # The first import walks the whole pool to build the path index
+            'firstImport': measure('importFileToBin', {'path': media[0], 'binName': 'sync/bench'}, 1),
+            'reimport': measure('importFileToBin', {'path': media[0], 'binName': 'sync/bench'}, args.iterations),
+        }
+        samples = []
+        for path in media[1:args.iterations + 1]:
+            elapsed_ms, _, _ = call('importFileToBin', {'path': path, 'binName': 'sync/bench'})
+            samples.append(elapsed_ms)
+        entry['importNew'] = stats(samples)
+        bulk = [{'path': path} for path in media[args.iterations + 1:]]
+        entry[f'bulkImport{len(bulk)}'] = measure('importFilesToBins', {'files': bulk, 'binName': 'sync/bulk'}, 1)
+        results[str(pool_size)] = entry
+    return results
+
+
+def read_version():
+    try:
+        with open(os.path.join(REPO_ROOT, 'package.json')) as f:
+            return json.load(f).get('version')
+    except Exception:
+        return None
+
+
+def read_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=False).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    global fake, api
+    parser = argparse.ArgumentParser(description='Benchmark resolve_api.py against an offline Resolve stand-in')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--only', help=f'comma-separated suites ({", ".join(SUITES)})')
+    parser.add_argument('--latency-ms', type=float, default=0.5, help='simulated latency per scripting call')
+    parser.add_argument('--render-fps', type=float, default=4800, help='simulated render speed')
+    parser.add_argument('--timeline-frames', type=int, default=480)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--export-iterations', type=int, default=3)
+    parser.add_argument('--cold-iterations', type=int, default=5)
+    parser.add_argument('--output-files', type=int, default=10000)
+    parser.add_argument('--pool-sizes', type=lambda value: [int(size) for size in value.split(',')], default=[1000, 10000])
+    parser.add_argument('--bulk-files', type=int, default=50)
+    args = parser.parse_args()
+
+    suites = [suite.strip() for suite in args.only.split(',')] if args.only else list(SUITES)
+    unknown = [suite for suite in suites if suite not in SUITES]
+    if unknown:
+        parser.error(f'unknown suites: {", ".join(unknown)}')
+
+    work_dir = tempfile.mkdtemp(prefix='resolve-bench-')
+    # resolve_api writes to ~/Documents/sync. outputs; keep that inside the work dir
+    os.environ['HOME'] = work_dir
+    os.environ['USERPROFILE'] = work_dir
+    os.environ['FAKE_RESOLVE_LATENCY_MS'] = str(args.latency_ms)
+    os.environ['FAKE_RESOLVE_RENDER_FPS'] = str(args.render_fps)
+    os.environ['FAKE_RESOLVE_TIMELINE_FRAMES'] = str(args.timeline_frames)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([HERE, os.environ.get('PYTHONPATH', '')]).rstrip(os.pathsep))
+    sys.path[:0] = [HERE, API_DIR]
+
+    import DaVinciResolveScript
+    import resolve_api
+    fake = DaVinciResolveScript
+    api = resolve_api
+
+    results = {}
+    try:
+        for suite in suites:
+            log(f'{suite}...')
+            start = time.perf_counter()
+            if suite == 'functions':
+                results[suite] = bench_functions(args, work_dir)
+            elif suite == 'coldStart':
+                results[suite] = bench_cold_start(args, work_dir, env)
+            elif suite == 'worker':
+                results[suite] = bench_worker(args, work_dir, env)
+            elif suite == 'export':
+                results[suite] = bench_export(args, work_dir)
+            elif suite == 'outputLookup':
+                results[suite] = bench_output_lookup(args, work_dir)
+            elif suite == 'mediaPool':
+                results[suite] = bench_media_pool(args, work_dir)
+            log(f'{suite} done in {time.perf_counter() - start:.1f}s')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'schema': SCHEMA_VERSION,
+        'version': read_version(),
+        'commit': read_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'latencyMs': args.latency_ms,
+            'renderFps': args.render_fps,
+            'timelineFrames': args.timeline_frames,
+            'iterations': args.iterations,
+            'exportIterations': args.export_iterations,
+            'outputFiles': args.output_files,
+            'poolSizes': args.pool_sizes,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        log(f'Wrote {args.output}')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,7 +15,7 @@ import { useVideoPlayer } from "../hooks/useVideoPlayer";
 import { useAudioPlayer } from "../hooks/useAudioPlayer";
 import { showToast, ToastMessages } from "../utils/toast";
 import { renderIconAsHTML } from "../utils/iconUtils";
-import { getStorageItem } from "../utils/storage";
+import { getStorageItem, setStorageItem } from "../utils/storage";
 import { STORAGE_KEYS, DELAYS } from "../utils/constants";
 import { parseJsonResponse } from "../utils/fetchUtils";
 import { debugLog, debugError } from "../utils/debugLog";
@@ -225,7 +225,18 @@ const SourcesTab: React.FC = () => {
         if (result?.ok && result?.path) {
           // setVideoPath will show loading overlay and handle upload
           // Video preview stays visible with loading state
-          await setVideoPath(result.path);
+          // Resolve returns the earlier upload when identical bytes were already uploaded
+          const previousUrl = (window as any).uploadedVideoUrl;
+          await setVideoPath(result.path, result.upload?.url);
+          if (result.upload?.url) {
+            // Jobs read uploadedVideoUrl first - point it at this export, not the previous one
+            (window as any).uploadedVideoUrl = result.upload.url;
+            setStorageItem(STORAGE_KEYS.UPLOADED_VIDEO_URL, result.upload.url);
+          }
+          const uploadedUrl = (window as any).uploadedVideoUrl;
+          if (result.digest && !result.upload?.url && uploadedUrl && uploadedUrl !== previousUrl) {
+            nle.recordUpload?.(result.path, uploadedUrl).catch(() => {});
+          }
           
           // Update UI state after upload completes
           if (typeof (window as any).updateLipsyncButton === "function") {
@@ -429,7 +440,18 @@ const SourcesTab: React.FC = () => {
           if (result?.ok && result?.path) {
             debugLog('[SourcesTab] Export successful, calling selectAudio', { path: result.path });
             // Set the path directly instead of opening file dialog
-            await setAudioPath(result.path);
+            // (reusing the earlier upload when identical bytes were already uploaded)
+            const previousUrl = (window as any).uploadedAudioUrl;
+            await setAudioPath(result.path, result.upload?.url);
+            if (result.upload?.url) {
+              // Jobs read uploadedAudioUrl first - point it at this export, not the previous one
+              (window as any).uploadedAudioUrl = result.upload.url;
+              setStorageItem(STORAGE_KEYS.UPLOADED_AUDIO_URL, result.upload.url);
+            }
+            const uploadedUrl = (window as any).uploadedAudioUrl;
+            if (result.digest && !result.upload?.url && uploadedUrl && uploadedUrl !== previousUrl) {
+              nle.recordUpload?.(result.path, uploadedUrl).catch(() => {});
+            }
             
             // Update UI state
             if (typeof (window as any).updateLipsyncButton === "function") {
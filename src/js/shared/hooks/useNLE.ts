@@ -15,6 +15,7 @@ interface NLEMethods {
   insertFileAtPlayhead: (fsPath?: string) => Promise<any>;
   importFileToBin: (fsPath?: string, binName?: string) => Promise<any>;
   revealFile: (fsPath?: string) => Promise<any>;
+  recordUpload?: (fsPath: string, url: string) => Promise<any>;
   diagInOut: () => Promise<any>;
 }
 
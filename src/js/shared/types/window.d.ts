@@ -49,6 +49,7 @@ interface Window {
     insertFileAtPlayhead: (fsPath?: string) => Promise<{ ok: boolean; error?: string }>;
     importFileToBin: (fsPath?: string, binName?: string) => Promise<{ ok: boolean; error?: string }>;
     revealFile: (fsPath?: string) => Promise<{ ok: boolean; error?: string }>;
+    recordUpload?: (fsPath: string, url: string) => Promise<{ ok: boolean; digest?: string; error?: string }>;
     diagInOut: () => Promise<{ inPoint?: number; outPoint?: number; error?: string }>;
   };
   electronAPI?: {
@@ -328,8 +328,294 @@ if (process.versions.electron) {
     return null;
   }
 
-  // Call Python API function
+  // Persistent Python workers (resolve_api.py --server) so calls skip interpreter
+  // startup and the Resolve connection handshake. A worker runs one request at a time
+  // and an export holds it for the whole render, so exports (and cancelRender, which
+  // must reach the process waiting on the render) get their own worker; panel calls
+  // such as getProjectDir or revealFile go to the main one and never queue behind a render
+  type PendingPythonCall = { resolve: (value: any) => void; reject: (reason: Error) => void; startedAt: number };
+  type PythonWorker = {
+    name: string;
+    process: ChildProcess | null;
+    buffer: string;
+    pending: Map<number, PendingPythonCall>;
+  };
+  const PYTHON_RENDER_FUNCTIONS = new Set([
+    'exportInOutVideo',
+    'exportInOutAudio',
+    'exportInOutCombined',
+    'exportInOutBatch',
+    'exportInOutSegmented',
+    'cancelRender',
+  ]);
+  const pythonWorkers: Record<'main' | 'render', PythonWorker> = {
+    main: { name: 'main', process: null, buffer: '', pending: new Map() },
+    render: { name: 'render', process: null, buffer: '', pending: new Map() },
+  };
+  let pythonWorkerDisabled = process.env.SYNC_RESOLVE_PYTHON_WORKER === '0';
+  // Shared by both workers, so a progress event's id identifies its request
+  let pythonWorkerNextId = 1;
+  // Latest render progress event from the worker ({ percent, etaMs, elapsedMs })
+  let pythonRenderProgress: Record<string, unknown> | null = null;
+  // Finished segments of segmented/batch exports, kept per request: percent events
+  // arrive every ~50 ms, so only a list lets a caller upload each chunk as it lands
+  type SegmentLog = { id: number; exportId: string | null; segments: Record<string, unknown>[]; done: boolean };
+  const PYTHON_SEGMENT_FUNCTIONS = new Set(['exportInOutSegmented', 'exportInOutBatch']);
+  const MAX_SEGMENT_LOGS = 5;
+  const pythonSegmentLogs: SegmentLog[] = [];
+
+  function startSegmentLog(id: number, payload: Record<string, unknown>): SegmentLog {
+    const log: SegmentLog = {
+      id,
+      exportId: typeof payload.exportId === 'string' ? payload.exportId : null,
+      segments: [],
+      done: false,
+    };
+    pythonSegmentLogs.push(log);
+    if (pythonSegmentLogs.length > MAX_SEGMENT_LOGS) pythonSegmentLogs.shift();
+    return log;
+  }
+
+  function findSegmentLog(exportId: string | null): SegmentLog | null {
+    if (!exportId) return pythonSegmentLogs[pythonSegmentLogs.length - 1] || null;
+    return pythonSegmentLogs.find((log) => log.exportId === exportId) || null;
+  }
+
+  function handlePythonProgress(id: number, data: Record<string, unknown>): void {
+    if (data && data.segment !== undefined) {
+      const log = pythonSegmentLogs.find((entry) => entry.id === id);
+      if (log) log.segments.push(data);
+      return;
+    }
+    pythonRenderProgress = { id, ...(data || {}) };
+  }
+
+  function failPythonWorkerCalls(state: PythonWorker, error: Error): void {
+    for (const pending of state.pending.values()) {
+      pending.reject(error);
+    }
+    state.pending.clear();
+  }
+
+  function handlePythonWorkerLine(state: PythonWorker, line: string): void {
+    let message: any;
+    try {
+      message = JSON.parse(line);
+    } catch (_) {
+      debugLog('Python worker emitted non-JSON line', { worker: state.name, line: line.substring(0, 200) });
+      return;
+    }
+    if (message.event === 'progress') {
+      handlePythonProgress(message.id, message.data || {});
+      return;
+    }
+    const pending = state.pending.get(message.id);
+    if (!pending) {
+      debugLog('Python worker response for unknown request', { worker: state.name, id: message.id });
+      return;
+    }
+    state.pending.delete(message.id);
+    if (!message.result || typeof message.result !== 'object') {
+      pending.reject(new Error('Python worker returned invalid result'));
+      return;
+    }
+    // Requests sent with { timings: true } also get the pipe round trip as seen from here
+    if (message.result.timings && typeof message.result.timings === 'object') {
+      message.result.timings.roundTripMs = Date.now() - pending.startedAt;
+    }
+    pending.resolve(message.result);
+  }
+
+  function getPythonWorker(state: PythonWorker): ChildProcess | null {
+    if (pythonWorkerDisabled) return null;
+    if (state.process && state.process.exitCode === null && !state.process.killed) return state.process;
+
+    const pythonScript = getPythonScriptPath();
+    const pythonInfo = findBundledPython();
+    if (!pythonInfo || !fs.existsSync(pythonScript)) return null;
+
+    debugLog('Starting Python worker', { worker: state.name, python: pythonInfo.python });
+    let worker: ChildProcess;
+    try {
+      worker = spawn(pythonInfo.python, ['-u', pythonScript, '--server'], {
+        cwd: path.dirname(pythonScript),
+        env: pythonInfo.env
+      });
+    } catch (error) {
+      const err = error as Error;
+      debugLog('Python worker spawn failed', { worker: state.name, error: err.message });
+      pythonWorkerDisabled = true;
+      return null;
+    }
+
+    state.buffer = '';
+    worker.stdout?.on('data', (data: Buffer) => {
+      state.buffer += data.toString();
+      let newline = state.buffer.indexOf('\n');
+      while (newline !== -1) {
+        const line = state.buffer.substring(0, newline).trim();
+        state.buffer = state.buffer.substring(newline + 1);
+        if (line) handlePythonWorkerLine(state, line);
+        newline = state.buffer.indexOf('\n');
+      }
+    });
+    worker.stderr?.on('data', (data: Buffer) => {
+      debugLog('Python worker stderr', { worker: state.name, stderr: data.toString().trim().substring(0, 500) });
+    });
+    worker.on('error', (error: Error) => {
+      debugLog('Python worker error', { worker: state.name, error: error.message });
+      // Spawning failed outright - stop retrying and use one-shot calls instead
+      pythonWorkerDisabled = true;
+      if (state.process === worker) state.process = null;
+      failPythonWorkerCalls(state, new Error(`Python worker failed: ${error.message}`));
+    });
+    worker.on('exit', (code: number | null) => {
+      debugLog('Python worker exited', { worker: state.name, code });
+      if (state.process === worker) state.process = null;
+      failPythonWorkerCalls(state, new Error(`Python worker exited with code ${code}`));
+    });
+
+    state.process = worker;
+    return worker;
+  }
+
+  function stopPythonWorkers(): void {
+    for (const state of Object.values(pythonWorkers)) {
+      const worker = state.process;
+      if (!worker) continue;
+      try {
+        worker.stdin?.write(JSON.stringify({ id: 0, fn: 'shutdown' }) + '\n');
+        worker.stdin?.end();
+      } catch (_) {
+        worker.kill();
+      }
+      state.process = null;
+    }
+  }
+
+  // Timeline watcher (resolve_api.py --watch) pushes timeline state changes, so the panel
+  // reads the latest snapshot from here instead of calling into Python on every refresh
+  let timelineWatcher: ChildProcess | null = null;
+  let timelineWatcherBuffer = '';
+  let timelineState: Record<string, unknown> | null = null;
+  let timelineStateVersion = 0;
+
+  function handleTimelineWatcherLine(line: string): void {
+    let message: any;
+    try {
+      message = JSON.parse(line);
+    } catch (_) {
+      debugLog('Timeline watcher emitted non-JSON line', { line: line.substring(0, 200) });
+      return;
+    }
+    if (message.event === 'state') {
+      timelineState = message.data || {};
+    } else if (message.event === 'change') {
+      const next: Record<string, unknown> = { ...(timelineState || {}), ...(message.changed || {}) };
+      for (const key of message.removed || []) delete next[key];
+      timelineState = next;
+    } else {
+      return;
+    }
+    timelineStateVersion++;
+  }
+
+  function ensureTimelineWatcher(): ChildProcess | null {
+    if (pythonWorkerDisabled) return null;
+    if (timelineWatcher && timelineWatcher.exitCode === null && !timelineWatcher.killed) return timelineWatcher;
+
+    const pythonScript = getPythonScriptPath();
+    const pythonInfo = findBundledPython();
+    if (!pythonInfo || !fs.existsSync(pythonScript)) return null;
+
+    debugLog('Starting timeline watcher', { python: pythonInfo.python });
+    let watcher: ChildProcess;
+    try {
+      watcher = spawn(pythonInfo.python, ['-u', pythonScript, '--watch'], {
+        cwd: path.dirname(pythonScript),
+        env: pythonInfo.env
+      });
+    } catch (error) {
+      const err = error as Error;
+      debugLog('Timeline watcher spawn failed', { error: err.message });
+      return null;
+    }
+
+    timelineWatcherBuffer = '';
+    watcher.stdout?.on('data', (data: Buffer) => {
+      timelineWatcherBuffer += data.toString();
+      let newline = timelineWatcherBuffer.indexOf('\n');
+      while (newline !== -1) {
+        const line = timelineWatcherBuffer.substring(0, newline).trim();
+        timelineWatcherBuffer = timelineWatcherBuffer.substring(newline + 1);
+        if (line) handleTimelineWatcherLine(line);
+        newline = timelineWatcherBuffer.indexOf('\n');
+      }
+    });
+    watcher.stderr?.on('data', (data: Buffer) => {
+      debugLog('Timeline watcher stderr', { stderr: data.toString().trim().substring(0, 500) });
+    });
+    watcher.on('error', (error: Error) => {
+      debugLog('Timeline watcher error', { error: error.message });
+      if (timelineWatcher === watcher) timelineWatcher = null;
+    });
+    watcher.on('exit', (code: number | null) => {
+      debugLog('Timeline watcher exited', { code });
+      if (timelineWatcher === watcher) {
+        timelineWatcher = null;
+        // A restarted watcher starts over with a full state line
+        timelineState = null;
+      }
+    });
+
+    timelineWatcher = watcher;
+    return watcher;
+  }
+
+  function stopTimelineWatcher(): void {
+    if (!timelineWatcher) return;
+    try {
+      // The watcher exits when its stdin closes
+      timelineWatcher.stdin?.end();
+    } catch (_) {
+      timelineWatcher.kill();
+    }
+    timelineWatcher = null;
+  }
+
+  // Call Python API function, preferring the warm worker and falling back to a one-shot process
   function callPythonAPI(functionName: string, payload: Record<string, unknown> | string = {}): Promise<any> {
+    const id = pythonWorkerNextId++;
+    const payloadObj = typeof payload === 'string' ? JSON.parse(payload || '{}') : payload;
+    if (!PYTHON_SEGMENT_FUNCTIONS.has(functionName)) {
+      return callPythonWorker(id, functionName, payload, payloadObj);
+    }
+    const log = startSegmentLog(id, payloadObj);
+    return callPythonWorker(id, functionName, payload, payloadObj).finally(() => { log.done = true; });
+  }
+
+  function callPythonWorker(id: number, functionName: string, payload: Record<string, unknown> | string, payloadObj: Record<string, unknown>): Promise<any> {
+    const state = PYTHON_RENDER_FUNCTIONS.has(functionName) ? pythonWorkers.render : pythonWorkers.main;
+    const worker = getPythonWorker(state);
+    if (!worker || !worker.stdin) {
+      return spawnPythonAPI(functionName, payload, id);
+    }
+
+    debugLog('Calling Python worker', { functionName, worker: state.name, id });
+
+    return new Promise((resolve, reject) => {
+      state.pending.set(id, { resolve, reject, startedAt: Date.now() });
+      worker.stdin!.write(JSON.stringify({ id, fn: functionName, payload: payloadObj }) + '\n', (error) => {
+        if (!error) return;
+        state.pending.delete(id);
+        debugLog('Python worker write failed, falling back to one-shot call', { error: error.message });
+        spawnPythonAPI(functionName, payload, id).then(resolve, reject);
+      });
+    });
+  }
+
+  // Call Python API function in a fresh process (one-shot CLI mode)
+  function spawnPythonAPI(functionName: string, payload: Record<string, unknown> | string = {}, id: number = pythonWorkerNextId++): Promise<any> {
     return new Promise((resolve, reject) => {
       const pythonScript = getPythonScriptPath();
       if (!fs.existsSync(pythonScript)) {
@@ -360,6 +646,7 @@ if (process.versions.electron) {
 
       debugLog('Calling Python API', { functionName, python: pythonInfo.python, payload: payloadStr });
 
+      const startedAt = Date.now();
       const pythonProcess = spawn(pythonInfo.python, args, {
         cwd: path.dirname(pythonScript),
         env: pythonInfo.env
@@ -367,16 +654,36 @@ if (process.versions.electron) {
 
       let stdout = '';
       let stderr = '';
+      let stderrBuffer = '';
 
       pythonProcess.stdout.on('data', (data: Buffer) => {
         stdout += data.toString();
       });
 
+      // Progress events come as JSON lines on stderr; everything else is diagnostics
+      const handleStderrLine = (line: string) => {
+        if (line.startsWith('{"event": "progress"')) {
+          try {
+            handlePythonProgress(id, JSON.parse(line).data || {});
+            return;
+          } catch (_) {
+            // Not a complete event - keep it as diagnostics
+          }
+        }
+        stderr += line + '\n';
+      };
       pythonProcess.stderr.on('data', (data: Buffer) => {
-        stderr += data.toString();
+        stderrBuffer += data.toString();
+        let newline = stderrBuffer.indexOf('\n');
+        while (newline !== -1) {
+          handleStderrLine(stderrBuffer.substring(0, newline));
+          stderrBuffer = stderrBuffer.substring(newline + 1);
+          newline = stderrBuffer.indexOf('\n');
+        }
       });
 
       pythonProcess.on('close', (code: number | null) => {
+        if (stderrBuffer) handleStderrLine(stderrBuffer);
         const trimmedStdout = stdout.trim();
         const trimmedStderr = stderr.trim();
         
@@ -452,6 +759,10 @@ if (process.versions.electron) {
             reject(new Error(`Python script returned invalid result: ${jsonStr.substring(0, 100)}`));
             return;
           }
+          // Includes interpreter spawn, which the Python side cannot see
+          if (result.timings && typeof result.timings === 'object') {
+            result.timings.processMs = Date.now() - startedAt;
+          }
           resolve(result);
         } catch (e) {
           const err = e as Error;
@@ -878,6 +1189,78 @@ if (process.versions.electron) {
         return;
       }
 
+      if (pathname === '/nle/exportInOutCombined' && req.method === 'POST') {
+        try {
+          let body = '';
+          req.on('data', (chunk: Buffer) => { body += chunk.toString(); });
+          req.on('end', async () => {
+            try {
+              const opts = JSON.parse(body || '{}');
+              const result = await callPythonAPI('exportInOutCombined', opts);
+              res.writeHead(200);
+              res.end(JSON.stringify(result));
+            } catch (error) {
+              const err = error as Error;
+              res.writeHead(500);
+              res.end(JSON.stringify({ ok: false, error: err.message }));
+            }
+          });
+        } catch (error) {
+          const err = error as Error;
+          res.writeHead(500);
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
+      if (pathname === '/nle/exportInOutBatch' && req.method === 'POST') {
+        try {
+          let body = '';
+          req.on('data', (chunk: Buffer) => { body += chunk.toString(); });
+          req.on('end', async () => {
+            try {
+              const opts = JSON.parse(body || '{}');
+              const result = await callPythonAPI('exportInOutBatch', opts);
+              res.writeHead(200);
+              res.end(JSON.stringify(result));
+            } catch (error) {
+              const err = error as Error;
+              res.writeHead(500);
+              res.end(JSON.stringify({ ok: false, error: err.message }));
+            }
+          });
+        } catch (error) {
+          const err = error as Error;
+          res.writeHead(500);
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
+      if (pathname === '/nle/exportInOutSegmented' && req.method === 'POST') {
+        try {
+          let body = '';
+          req.on('data', (chunk: Buffer) => { body += chunk.toString(); });
+          req.on('end', async () => {
+            try {
+              const opts = JSON.parse(body || '{}');
+              const result = await callPythonAPI('exportInOutSegmented', opts);
+              res.writeHead(200);
+              res.end(JSON.stringify(result));
+            } catch (error) {
+              const err = error as Error;
+              res.writeHead(500);
+              res.end(JSON.stringify({ ok: false, error: err.message }));
+            }
+          });
+        } catch (error) {
+          const err = error as Error;
+          res.writeHead(500);
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
       if (pathname === '/nle/importFileToBin' && req.method === 'POST') {
         try {
           let body = '';
@@ -902,6 +1285,30 @@ if (process.versions.electron) {
         return;
       }
 
+      if (pathname === '/nle/importFilesToBins' && req.method === 'POST') {
+        try {
+          let body = '';
+          req.on('data', (chunk: Buffer) => { body += chunk.toString(); });
+          req.on('end', async () => {
+            try {
+              const payload = JSON.parse(body || '{}');
+              const result = await callPythonAPI('importFilesToBins', payload);
+              res.writeHead(200);
+              res.end(JSON.stringify(result));
+            } catch (error) {
+              const err = error as Error;
+              res.writeHead(500);
+              res.end(JSON.stringify({ ok: false, error: err.message }));
+            }
+          });
+        } catch (error) {
+          const err = error as Error;
+          res.writeHead(500);
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
       if (pathname === '/nle/insertFileAtPlayhead' && req.method === 'POST') {
         try {
           let body = '';
@@ -950,6 +1357,114 @@ if (process.versions.electron) {
         return;
       }
 
+      if (pathname === '/nle/cancelRender' && req.method === 'POST') {
+        try {
+          const result = await callPythonAPI('cancelRender', {});
+          res.writeHead(200);
+          res.end(JSON.stringify(result));
+        } catch (error) {
+          const err = error as Error;
+          res.writeHead(500);
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
+      if (pathname === '/nle/recordUpload' && req.method === 'POST') {
+        try {
+          let body = '';
+          req.on('data', (chunk: Buffer) => { body += chunk.toString(); });
+          req.on('end', async () => {
+            try {
+              const payload = JSON.parse(body || '{}');
+              const result = await callPythonAPI('recordUpload', payload);
+              res.writeHead(200);
+              res.end(JSON.stringify(result));
+            } catch (error) {
+              const err = error as Error;
+              res.writeHead(500);
+              res.end(JSON.stringify({ ok: false, error: err.message }));
+            }
+          });
+        } catch (error) {
+          const err = error as Error;
+          res.writeHead(500);
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
+      if (pathname === '/nle/renderProgress' && req.method === 'GET') {
+        res.writeHead(200);
+        res.end(JSON.stringify({ ok: true, progress: pythonRenderProgress }));
+        return;
+      }
+
+      if (pathname === '/nle/renderSegments' && req.method === 'GET') {
+        const log = findSegmentLog(parsedUrl.searchParams.get('exportId'));
+        const since = Math.max(0, Number(parsedUrl.searchParams.get('since')) || 0);
+        res.writeHead(200);
+        if (!log) {
+          res.end(JSON.stringify({ ok: true, id: null, exportId: null, done: true, segments: [], total: 0 }));
+          return;
+        }
+        res.end(JSON.stringify({
+          ok: true,
+          id: log.id,
+          exportId: log.exportId,
+          done: log.done,
+          segments: log.segments.slice(since),
+          total: log.segments.length,
+        }));
+        return;
+      }
+
+      if (pathname === '/nle/timelineState' && req.method === 'GET') {
+        try {
+          // Served from the watcher's pushed state; ?since=<version> returns only whether it changed
+          const watcher = ensureTimelineWatcher();
+          if (!timelineState) {
+            // No pushed state yet (watcher just spawned, or unavailable): read it once directly
+            const result = await callPythonAPI('getTimelineState', {});
+            res.writeHead(200, { 'Content-Type': 'application/json' });
+            res.end(JSON.stringify({ ok: true, live: !!watcher, version: timelineStateVersion, state: result }));
+            return;
+          }
+          const since = Number(parsedUrl.searchParams.get('since'));
+          res.writeHead(200, { 'Content-Type': 'application/json' });
+          if (timelineState && since === timelineStateVersion) {
+            res.end(JSON.stringify({ ok: true, live: true, version: timelineStateVersion, changed: false }));
+          } else {
+            res.end(JSON.stringify({ ok: true, live: true, version: timelineStateVersion, state: timelineState }));
+          }
+        } catch (error) {
+          const err = error as Error;
+          debugLog('timelineState error', { error: err.message });
+          res.writeHead(500, { 'Content-Type': 'application/json' });
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
+      if (pathname === '/nle/getTimelineState' && req.method === 'GET') {
+        try {
+          // ?fields=project,playhead,markers selects what the Python side reads
+          const fields = (parsedUrl.searchParams.get('fields') || '')
+            .split(',')
+            .map((field) => field.trim())
+            .filter(Boolean);
+          const result = await callPythonAPI('getTimelineState', fields.length ? { fields } : {});
+          res.writeHead(200, { 'Content-Type': 'application/json' });
+          res.end(JSON.stringify(result));
+        } catch (error) {
+          const err = error as Error;
+          debugLog('getTimelineState error', { error: err.message });
+          res.writeHead(500, { 'Content-Type': 'application/json' });
+          res.end(JSON.stringify({ ok: false, error: err.message }));
+        }
+        return;
+      }
+
       if (pathname === '/nle/diagInOut' && req.method === 'GET') {
         try {
           const result = await callPythonAPI('diagInOut', {});
@@ -1217,6 +1732,11 @@ if (process.versions.electron) {
     createWindow();
   });
 
+  app.on('will-quit', () => {
+    stopPythonWorkers();
+    stopTimelineWatcher();
+  });
+
   app.on('window-all-closed', () => {
     debugLog('All windows closed');
     if (process.platform !== 'darwin') {
@@ -4,49 +4,940 @@ DaVinci Resolve Python API Bridge
 Provides functions that mirror ExtendScript functions but use Resolve Python API
 """
 
+import time
+
+_MODULE_START = time.perf_counter()
+
 import sys
 import json
 import os
-import subprocess
-import platform
-import time
+import threading
 
-# Try to import Resolve API
-try:
-    import DaVinciResolveScript as dvr_script
-    resolve = dvr_script.scriptapp("Resolve")
-except ImportError:
-    resolve = None
-except Exception as e:
-    resolve = None
-    print(f"Error importing Resolve API: {e}", file=sys.stderr)
+import tracing
+import waveform
+from timecode import get_rate, parse_frame_rate
+
+# The Resolve connection is made lazily by _get_resolve(), so commands that only
+# touch the filesystem (e.g. revealFile) never pay for it or block on a busy Resolve
+resolve = None
+_resolve_last_attempt = None
+_RESOLVE_RETRY_INTERVAL = 1.0
+
+# Phase timings of the most recent connection attempt, reported by --profile-startup
+_startup_timings = {}
+
+@tracing.phase('connect')
+def _connect_resolve():
+    """Import the Resolve API and connect to the running Resolve instance"""
+    global resolve, _resolve_last_attempt
+    _resolve_last_attempt = time.perf_counter()
+    start = _resolve_last_attempt
+    _startup_timings.clear()
+    # Handles from a previous connection are proxies into a dead session
+    _handles.clear()
+    try:
+        import DaVinciResolveScript as dvr_script
+        imported = time.perf_counter()
+        _startup_timings['resolveImportMs'] = round((imported - start) * 1000, 3)
+        # Every handle derived from this one times its scripting calls (see tracing.py)
+        resolve = tracing.traced(dvr_script.scriptapp("Resolve"))
+        _startup_timings['resolveConnectMs'] = round((time.perf_counter() - imported) * 1000, 3)
+    except ImportError:
+        resolve = None
+    except Exception as e:
+        resolve = None
+        print(f"Error importing Resolve API: {e}", file=sys.stderr)
+    return resolve
+
+def _get_resolve():
+    """Get the Resolve scripting object, connecting on first use"""
+    if resolve:
+        return resolve
+    # Don't hammer a missing/busy Resolve when several helpers ask in one request
+    if _resolve_last_attempt is not None and time.perf_counter() - _resolve_last_attempt < _RESOLVE_RETRY_INTERVAL:
+        return None
+    return _connect_resolve()
 
 def _respond(data):
     """Format response as JSON string"""
     return json.dumps(data)
 
+# Cached scripting handles. Every Resolve call is a cross-process RPC, so the project,
+# timeline, media pool, root folder and timeline settings are looked up at most once
+# per request and, in worker mode, reused across requests while the project name /
+# timeline unique ID identity checks keep passing.
+_handles = {}
+_request_serial = 0
+
+# Settings can be edited without changing the timeline identity, so cap their age
+_SETTINGS_MAX_AGE = 30.0
+
+def _begin_request():
+    """Mark the start of a request so cached handles are revalidated once"""
+    global _request_serial
+    _request_serial += 1
+
+def _drop_connection():
+    """Forget the Resolve connection and every handle derived from it"""
+    global resolve
+    resolve = None
+    _handles.clear()
+
+def _invalidate_handles(*keys):
+    """Drop the given cached handles"""
+    for key in keys:
+        _handles.pop(key, None)
+
 def _get_project():
     """Get current Resolve project"""
-    if not resolve:
-        return None
+    if _handles.get('projectSerial') == _request_serial:
+        return _handles.get('project')
     try:
-        project_manager = resolve.GetProjectManager()
+        project_manager = _handles.get('projectManager')
         if not project_manager:
-            return None
-        return project_manager.GetCurrentProject()
+            resolve = _get_resolve()
+            if not resolve:
+                return None
+            project_manager = resolve.GetProjectManager()
+            if not project_manager:
+                return None
+            _handles['projectManager'] = project_manager
+        project = project_manager.GetCurrentProject()
+        project_id = project.GetName() if project else None
     except Exception as e:
+        # Usually means Resolve went away; reconnect on the next request
         print(f"Error getting project: {e}", file=sys.stderr)
+        _drop_connection()
         return None
 
+    if project_id != _handles.get('projectId'):
+        # Switched projects: everything derived from the old one is stale
+        _invalidate_handles('timeline', 'timelineId', 'timelineSerial', 'mediaPool', 'rootFolder', 'timelineSettings',
+                            'mediaIndex', 'folderIndex')
+    _handles['project'] = project
+    _handles['projectId'] = project_id
+    _handles['projectSerial'] = _request_serial
+    return project
+
 def _get_timeline():
     """Get current timeline"""
+    if _handles.get('timelineSerial') == _request_serial:
+        return _handles.get('timeline')
+    project = _get_project()
+    if not project:
+        return None
+    try:
+        timeline = project.GetCurrentTimeline()
+        timeline_id = timeline.GetUniqueId() if timeline else None
+    except:
+        return None
+
+    if timeline_id != _handles.get('timelineId'):
+        _invalidate_handles('timelineSettings')
+    _handles['timeline'] = timeline
+    _handles['timelineId'] = timeline_id
+    _handles['timelineSerial'] = _request_serial
+    return timeline
+
+def _get_media_pool():
+    """Get the current project's media pool"""
+    project = _get_project()
+    if not project:
+        return None
+    media_pool = _handles.get('mediaPool')
+    if not media_pool:
+        try:
+            media_pool = project.GetMediaPool()
+        except:
+            return None
+        if media_pool:
+            _handles['mediaPool'] = media_pool
+    return media_pool
+
+def _get_root_folder():
+    """Get the media pool's root folder"""
+    media_pool = _get_media_pool()
+    if not media_pool:
+        return None
+    root_folder = _handles.get('rootFolder')
+    if not root_folder:
+        try:
+            root_folder = media_pool.GetRootFolder()
+        except:
+            return None
+        if root_folder:
+            _handles['rootFolder'] = root_folder
+    return root_folder
+
+@tracing.phase('settings')
+def _get_timeline_settings():
+    """Get timeline width, height, frame rate and drop-frame flag (with 1920x1080@24 fallbacks)"""
     project = _get_project()
+    # Settings are keyed on the timeline too; resolve it so a switch is noticed
+    _get_timeline()
+    cached = _handles.get('timelineSettings')
+    if cached and time.monotonic() - cached['fetchedAt'] < _SETTINGS_MAX_AGE:
+        return cached
+
+    settings = {'width': 1920, 'height': 1080, 'fps': 24.0, 'dropFrame': False, 'fetchedAt': time.monotonic()}
     if not project:
+        return settings
+    try:
+        width_str = project.GetSetting('timelineResolutionWidth')
+        height_str = project.GetSetting('timelineResolutionHeight')
+        fps_str = project.GetSetting('timelineFrameRate')
+        settings['width'] = int(width_str) if width_str else 1920
+        settings['height'] = int(height_str) if height_str else 1080
+        settings['fps'] = parse_frame_rate(fps_str) if fps_str else 24.0
+        settings['dropFrame'] = str(project.GetSetting('timelineDropFrameTimecode')) == '1'
+    except:
+        pass
+    _handles['timelineSettings'] = settings
+    return settings
+
+def _get_timecode_rate():
+    """Get the timecode converter for the current timeline's frame rate"""
+    settings = _get_timeline_settings()
+    # get_rate() memoizes per rate, so this costs no RPCs beyond the cached settings
+    return get_rate(settings['fps'], settings['dropFrame'])
+
+# Render monitoring. Exports follow their own job via GetRenderJobStatus() and poll
+# faster as completion approaches, so a finished render is noticed within tens of ms.
+_RENDER_POLL_MIN = 0.05
+_RENDER_POLL_MAX = 1.0
+_RENDER_DONE_STATES = ('Complete', 'Failed', 'Cancelled')
+
+# Set for the whole of an export request (from settings push to the last render), so a
+# cancelRender arriving before the render starts still reaches it; cancelRender sets
+# _render_cancel, which the render monitor acts on
+_EXPORT_FUNCTIONS = ('exportInOutVideo', 'exportInOutAudio', 'exportInOutCombined',
+                     'exportInOutBatch', 'exportInOutSegmented')
+_render_active = threading.Event()
+_render_cancel = threading.Event()
+
+# Receives progress events for the current request (set by serve())
+_progress_sink = None
+
+def _report_progress(data):
+    """Send a progress event to the caller, if anyone is listening"""
+    if not _progress_sink:
+        return
+    try:
+        _progress_sink(data)
+    except Exception as e:
+        print(f"Error reporting progress: {e}", file=sys.stderr)
+
+def _render_timeout(frame_count, fps):
+    """Initial render timeout (seconds) from the range length, before speed is measured"""
+    duration = frame_count / (fps or 24.0)
+    # Room for a render 10x slower than realtime plus job setup
+    return 120.0 + duration * 10.0
+
+def _start_render_job(project):
+    """Queue a job from the current render settings and start rendering only that job"""
+    output_dir = _get_output_dir()
+    _clean_render_queue(project, output_dir)
+    job_id = project.AddRenderJob()
+    if not job_id:
+        # Older Resolve versions don't return job IDs; render the queue as before
+        project.StartRendering()
+        return None
+    _track_render_jobs(output_dir, [job_id])
+    if not project.StartRendering([job_id]):
+        project.StartRendering(job_id)
+    return job_id
+
+def _get_render_status(project, job_id):
+    """Get GetRenderJobStatus() for a job, or an equivalent built from IsRenderingInProgress()"""
+    if job_id:
+        try:
+            return project.GetRenderJobStatus(job_id) or {}
+        except:
+            return {}
+    return {'JobStatus': 'Rendering' if project.IsRenderingInProgress() else 'Complete'}
+
+@tracing.phase('renderWait')
+def _wait_for_renders(project, job_ids, frame_count, fps, on_job_done=None, watch=None):
+    """Wait for render jobs to finish, streaming percent/ETA progress events
+
+    on_job_done(job_id, job_result) is called as soon as each job finishes.
+    watch(percent) is called on every poll; returning an error string stops the
+    render with status 'Aborted'.
+    Returns {'status': 'Complete' | 'Failed' | 'Cancelled' | 'Timeout' | 'Aborted',
+    'renderMs': ..., 'jobs': {job_id: {'status': ..., 'error': ...}}}; status is
+    'Complete' only when every job completed.
+    """
+    start = time.monotonic()
+    deadline = start + _render_timeout(frame_count, fps)
+    interval = _RENDER_POLL_MIN
+    last_percent = None
+    jobs = {}
+
+    def finish(status, error=None):
+        result = {'status': status, 'renderMs': int((time.monotonic() - start) * 1000), 'jobs': jobs}
+        if status == 'Failed':
+            errors = [job.get('error') for job in jobs.values() if job.get('error')]
+            error = errors[0] if errors else 'Render failed'
+        if error:
+            result['error'] = error
+        return result
+
+    while True:
+        if _render_cancel.is_set():
+            try:
+                project.StopRendering()
+            except:
+                pass
+            return finish('Cancelled')
+
+        now = time.monotonic()
+        elapsed = now - start
+        percents = []
+        eta_ms = None
+        for job_id in job_ids:
+            if job_id in jobs:
+                percents.append(100)
+                continue
+            status = _get_render_status(project, job_id)
+            job_status = status.get('JobStatus')
+            if job_status in _RENDER_DONE_STATES:
+                jobs[job_id] = {'status': job_status, 'renderMs': int(elapsed * 1000)}
+                if job_status == 'Failed':
+                    jobs[job_id]['error'] = status.get('Error') or 'Render failed'
+                if on_job_done:
+                    on_job_done(job_id, jobs[job_id])
+                percents.append(100)
+                continue
+            percents.append(status.get('CompletionPercentage') or 0)
+            if status.get('EstimatedTimeRemainingInMs'):
+                eta_ms = max(eta_ms or 0, status['EstimatedTimeRemainingInMs'])
+
+        if len(jobs) == len(job_ids):
+            statuses = set(job['status'] for job in jobs.values())
+            if statuses == {'Complete'}:
+                return finish('Complete')
+            return finish('Cancelled' if statuses == {'Cancelled'} else 'Failed')
+
+        percent = int(sum(percents) / len(percents))
+        if percent and not eta_ms:
+            eta_ms = int(elapsed * 1000 * (100 - percent) / percent)
+        if percent != last_percent:
+            last_percent = percent
+            _report_progress({'percent': percent, 'etaMs': eta_ms, 'elapsedMs': int(elapsed * 1000)})
+            if percent > 0:
+                # Extend the deadline from the measured speed, with 2x slack
+                deadline = max(deadline, start + elapsed * 100.0 / percent * 2 + 30)
+
+        abort_error = watch(percent) if watch else None
+        if abort_error:
+            try:
+                project.StopRendering()
+            except:
+                pass
+            return finish('Aborted', abort_error)
+
+        if now >= deadline:
+            # Don't leave Resolve rendering jobs nobody is waiting for
+            try:
+                project.StopRendering()
+            except:
+                pass
+            return finish('Timeout')
+
+        if eta_ms:
+            # Poll a few times over the remaining time so completion is seen promptly
+            interval = min(max(eta_ms / 4000.0, _RENDER_POLL_MIN), _RENDER_POLL_MAX)
+        else:
+            interval = min(interval * 1.5, _RENDER_POLL_MAX)
+        _render_cancel.wait(interval)
+
+def _wait_for_render(project, job_id, frame_count, fps, watch=None):
+    """Wait for a single render job to finish (see _wait_for_renders)"""
+    return _wait_for_renders(project, [job_id], frame_count, fps, watch=watch)
+
+def _render_failure(render):
+    """Error response for a render that did not complete"""
+    if render['status'] == 'Cancelled':
+        return _respond({'ok': False, 'error': 'Render cancelled', 'cancelled': True})
+    if render['status'] == 'Timeout':
+        return _respond({'ok': False, 'error': 'Render timeout'})
+    if render['status'] == 'Aborted':
+        return _respond({'ok': False, 'error': render['error'], 'aborted': True})
+    return _respond({'ok': False, 'error': f"Render failed: {render.get('error', 'unknown error')}"})
+
+# Resolve format/codec names and file extension for each export codec option
+_VIDEO_CODECS = {
+    'h264': ('mp4', 'H264', 'mp4'),
+    'prores_422hq': ('mov', 'Apple ProRes 422 HQ', 'mov'),
+    'prores_422': ('mov', 'Apple ProRes 422', 'mov'),
+    'upload': ('mp4', 'H264', 'mp4'),
+    'upload_hq': ('mp4', 'H264', 'mp4'),
+}
+
+# Upload profiles: small H264 proxies for sending to the lipsync model rather than
+# editing. Any field can be overridden per call through the export opts.
+_UPLOAD_PROFILES = {
+    'upload': {'maxLongEdge': 1280, 'videoBitrate': 4000, 'maxFps': 30, 'audioCodec': 'aac'},
+    'upload_hq': {'maxLongEdge': 1920, 'videoBitrate': 10000, 'maxFps': 60, 'audioCodec': 'aac'},
+}
+
+def _upload_render_settings(codec, opts, width, height, fps):
+    """Resolve an upload profile into output size, frame rate, bitrate (kbps) and audio codec"""
+    profile = dict(_UPLOAD_PROFILES[codec])
+    for key in profile:
+        if opts.get(key) is not None:
+            profile[key] = opts[key]
+    
+    # Scale the long edge down (never up), keeping dimensions even for H264
+    scale = min(1.0, float(profile['maxLongEdge']) / max(width, height))
+    out_width = max(2, int(round(width * scale / 2.0)) * 2)
+    out_height = max(2, int(round(height * scale / 2.0)) * 2)
+    
+    # Decimate by a whole factor so frames are dropped evenly (59.94 -> 29.97, 50 -> 25)
+    out_fps = fps
+    max_fps = profile['maxFps']
+    if max_fps and fps > max_fps + 0.01:
+        step = int(-(-fps // max_fps))
+        out_fps = round(fps / step, 3)
+    
+    audio_codec = 'pcm' if profile['audioCodec'] == 'pcm' else 'aac'
+    return {
+        'width': out_width,
+        'height': out_height,
+        'fps': out_fps,
+        'videoBitrate': int(profile['videoBitrate']),
+        'audioCodec': audio_codec,
+        # MP4 from Resolve can't carry PCM audio
+        'container': 'mov' if audio_codec == 'pcm' else 'mp4',
+    }
+
+def _get_output_dir():
+    """Get (and create) the Documents/sync. outputs directory"""
+    output_dir = os.path.join(os.path.expanduser('~'), 'Documents', 'sync. outputs')
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+def _get_in_out_points(timeline):
+    """Get the timeline's mark in/out frames, falling back to the whole timeline"""
+    # Get in/out points using GetMarkInOut() which returns a dict
+    try:
+        mark_in_out = timeline.GetMarkInOut()
+        # GetMarkInOut() returns dict like {video: {in: 0, out: 134}, audio: {in: 0, out: 134}}
+        # or empty dict if not set
+        if mark_in_out and 'video' in mark_in_out:
+            video_marks = mark_in_out['video']
+            return video_marks.get('in', timeline.GetStartFrame()), video_marks.get('out', timeline.GetEndFrame())
+    except:
+        pass
+    # No marks set, use timeline range
+    return timeline.GetStartFrame(), timeline.GetEndFrame()
+
+@tracing.phase('renderSettings')
+def _set_render_format(project, format_str, codec_name):
+    """Select a render format/codec with SetCurrentRenderFormatAndCodec(); returns an error or None"""
+    # Note: Format and Codec are NOT supported in SetRenderSettings() dict
+    # According to API docs, SetRenderSettings() does NOT include Format/Codec keys
+    # These must be set separately using SetCurrentRenderFormatAndCodec()
+    try:
+        if not project.SetCurrentRenderFormatAndCodec(format_str, codec_name):
+            return f'Failed to set render format/codec. Format: {format_str}, Codec: {codec_name}'
+    except Exception as e:
+        return f'Failed to set render format/codec: {str(e)}. Format: {format_str}, Codec: {codec_name}'
+    return None
+
+def _set_video_format(project, codec, container=None):
+    """Select the render format/codec for an export codec option; returns an error or None"""
+    format_str, video_codec, _ = _VIDEO_CODECS.get(codec, _VIDEO_CODECS['prores_422'])
+    return _set_render_format(project, container or format_str, video_codec)
+
+# Render format and codec for each audio export format. Audio-only jobs still write
+# the current render format's container, so it must be set like a video codec
+_AUDIO_FORMATS = {
+    'wav': ('wav', 'LinearPCM'),
+    'mp3': ('mp3', 'MP3'),
+}
+
+# Each export profile keeps a render preset, so repeat exports load one preset instead of
+# pushing the format, codec and every setting again. The name carries a hash of the
+# profile's settings, so a changed profile (e.g. new timeline resolution) gets a new preset.
+_RENDER_PRESET_PREFIX = 'sync_'
+_RENDER_PRESET_DIGEST_LENGTH = 10
+
+def _apply_render_profile(project, profile, profile_settings, call_settings, codec=None, container=None,
+                          audio_format=None):
+    """Load (or create) the render preset for an export profile, then apply the per-call
+    settings (target, name, range); returns an error string or None
+
+    codec selects a video format (see _VIDEO_CODECS), audio_format an audio-only one
+    (see _AUDIO_FORMATS).
+    """
+    import hashlib
+    digest = hashlib.sha1(json.dumps([codec, container, audio_format, profile_settings], sort_keys=True).encode('utf-8')).hexdigest()[:_RENDER_PRESET_DIGEST_LENGTH]
+    preset_name = f'{_RENDER_PRESET_PREFIX}{profile}_{digest}'
+    try:
+        loaded = bool(project.LoadRenderPreset(preset_name))
+    except:
+        loaded = False
+    
+    if not loaded:
+        if codec:
+            format_error = _set_video_format(project, codec, container)
+        elif audio_format:
+            format_error = _set_render_format(project, *_AUDIO_FORMATS[audio_format])
+        else:
+            format_error = None
+        if format_error:
+            return format_error
+        project.SetRenderSettings(profile_settings)
+        _save_render_preset(project, profile, preset_name)
+    
+    project.SetRenderSettings(call_settings)
+    return None
+
+def _save_render_preset(project, profile, preset_name):
+    """Save the current render settings as preset_name, replacing older presets of the profile"""
+    stale_prefix = f'{_RENDER_PRESET_PREFIX}{profile}_'
+    try:
+        for name in project.GetRenderPresetList() or []:
+            if not isinstance(name, str) or not name.startswith(stale_prefix) or name == preset_name:
+                continue
+            # Only this profile's own presets: the rest must be exactly the digest, so
+            # e.g. "upload" never matches "sync_upload_hq_<digest>"
+            digest = name[len(stale_prefix):]
+            if len(digest) == _RENDER_PRESET_DIGEST_LENGTH and all(c in '0123456789abcdef' for c in digest):
+                project.DeleteRenderPreset(name)
+        project.SaveAsNewRenderPreset(preset_name)
+    except Exception as e:
+        # Presets only save work; exports still render without one
+        print(f"Error saving render preset {preset_name}: {e}", file=sys.stderr)
+
+# Small JSON stores kept next to the outputs (hidden, one file per store)
+def _store_path(output_dir, name):
+    return os.path.join(output_dir, f'.sync_{name}.json')
+
+def _load_store(output_dir, name):
+    """Load a JSON store from the outputs directory ({} if missing or unreadable)"""
+    try:
+        with open(_store_path(output_dir, name), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except:
+        return {}
+
+def _save_store(output_dir, name, data):
+    """Atomically write a JSON store to the outputs directory"""
+    path = _store_path(output_dir, name)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error saving {name} store: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp_path)
+        except:
+            pass
+
+# Index of render outputs we have located, by CustomName
+_OUTPUT_INDEX_LIMIT = 5000
+
+def _index_output(output_dir, base_name, path):
+    """Record a located render output in the persisted output index"""
+    index = _load_store(output_dir, 'outputs')
+    index[base_name] = os.path.basename(path)
+    if len(index) > _OUTPUT_INDEX_LIMIT:
+        # Insertion order is age order; keep the newest entries
+        index = dict(list(index.items())[-_OUTPUT_INDEX_LIMIT:])
+    _save_store(output_dir, 'outputs', index)
+
+# Content digests of outputs (SHA-256 -> file, size, mtime, upload), so identical bytes
+# exported again can reuse the earlier upload instead of being uploaded twice
+_DIGEST_INDEX_LIMIT = 5000
+_HASH_CHUNK_BYTES = 8 * 1024 * 1024
+# Signed upload URLs expire; don't hand out one that is about to
+_UPLOAD_REUSE_MARGIN = 300
+_UPLOAD_DEFAULT_TTL = 3600
+
+@tracing.phase('digest')
+def _hash_file(path):
+    """SHA-256 of a file, read through one fixed buffer so memory stays flat"""
+    import hashlib
+    digest = hashlib.sha256()
+    buffer = bytearray(_HASH_CHUNK_BYTES)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+def _file_digest(index, path):
+    """Digest of path, reusing the index entry when the file is unchanged since it was hashed"""
+    stat = os.stat(path)
+    name = os.path.basename(path)
+    for digest, entry in index.items():
+        if entry.get('file') == name and entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            return digest, stat
+    return _hash_file(path), stat
+
+def _valid_upload(entry):
+    upload = entry.get('upload') if entry else None
+    if upload and upload.get('expiresAt', 0) > time.time() + _UPLOAD_REUSE_MARGIN:
+        return upload
+    return None
+
+def _save_digests(output_dir, index):
+    """Save the digest index; entries are re-inserted when seen, so the oldest come first"""
+    if len(index) > _DIGEST_INDEX_LIMIT:
+        index = dict(list(index.items())[-_DIGEST_INDEX_LIMIT:])
+    _save_store(output_dir, 'digests', index)
+
+def _record_output_digest(output_dir, path):
+    """Digest an output and record it; returns {digest, seenBefore, upload?}"""
+    index = _load_store(output_dir, 'digests')
+    digest, stat = _file_digest(index, path)
+    previous = index.pop(digest, None)
+    entry = {'file': os.path.basename(path), 'size': stat.st_size, 'mtime': stat.st_mtime, 'lastSeen': time.time()}
+    upload = _valid_upload(previous)
+    if upload:
+        entry['upload'] = upload
+    index[digest] = entry
+    _save_digests(output_dir, index)
+    result = {'digest': digest, 'seenBefore': previous is not None}
+    if upload:
+        result['upload'] = upload
+    return result
+
+# Render jobs queued by sync (job ID -> time queued), so only they are ever deleted
+def _track_render_jobs(output_dir, job_ids):
+    """Record render jobs this extension queued"""
+    jobs = _load_store(output_dir, 'render_jobs')
+    queued_at = int(time.time())
+    for job_id in job_ids:
+        jobs[job_id] = queued_at
+    _save_store(output_dir, 'render_jobs', jobs)
+
+def _is_sync_job(job, tracked, output_dir):
+    """Check whether a GetRenderJobList() entry was queued by sync"""
+    if job.get('JobId') in tracked:
+        return True
+    # Jobs queued before IDs were recorded: sync_export* names in the sync outputs dir
+    target_dir = job.get('TargetDir') or ''
+    return (bool(target_dir) and os.path.normpath(target_dir) == os.path.normpath(output_dir)
+            and str(job.get('OutputFilename') or '').startswith('sync_export'))
+
+def _clean_render_queue(project, output_dir):
+    """Delete finished sync jobs from Resolve's render queue; returns how many were deleted
+
+    Only completed, failed or cancelled jobs queued by sync are removed. Jobs the user
+    queued, and any job that is still pending or rendering, are left alone.
+    """
+    tracked = _load_store(output_dir, 'render_jobs')
+    try:
+        queue = project.GetRenderJobList() or []
+    except Exception as e:
+        print(f"Error reading render job list: {e}", file=sys.stderr)
+        return 0
+    
+    queued_ids = set()
+    deleted = 0
+    for job in queue:
+        job_id = job.get('JobId')
+        if not job_id or not _is_sync_job(job, tracked, output_dir):
+            continue
+        queued_ids.add(job_id)
+        if _get_render_status(project, job_id).get('JobStatus') not in _RENDER_DONE_STATES:
+            continue
+        try:
+            if project.DeleteRenderJob(job_id):
+                deleted += 1
+                queued_ids.discard(job_id)
+        except:
+            pass
+    
+    # Forget jobs that are gone from the queue (deleted here or by the user)
+    remaining = dict((job_id, queued_at) for job_id, queued_at in tracked.items() if job_id in queued_ids)
+    if remaining != tracked:
+        _save_store(output_dir, 'render_jobs', remaining)
+    return deleted
+
+def _get_job_output(project, job_id):
+    """Get the output path Resolve recorded for a render job, or None"""
+    if not job_id:
+        return None
+    try:
+        for job in project.GetRenderJobList() or []:
+            if job.get('JobId') == job_id:
+                if job.get('TargetDir') and job.get('OutputFilename'):
+                    return os.path.join(job['TargetDir'], job['OutputFilename'])
+                return None
+    except Exception as e:
+        print(f"Error reading render job list: {e}", file=sys.stderr)
+    return None
+
+@tracing.phase('outputLookup')
+def _find_render_output(project, job_id, output_dir, base_name, exts):
+    """Find the file a render job wrote, without listing the outputs directory
+
+    Tries the job's own TargetDir/OutputFilename, then the expected
+    CustomName.ext, then the persisted output index. Only as a last resort does it
+    scan, and then it only accepts files named after this job's CustomName.
+    """
+    path = _get_job_output(project, job_id)
+    if path and os.path.isfile(path):
+        _index_output(output_dir, base_name, path)
+        return path
+    for ext in exts:
+        path = os.path.join(output_dir, f'{base_name}.{ext}')
+        if os.path.isfile(path):
+            _index_output(output_dir, base_name, path)
+            return path
+    known = _load_store(output_dir, 'outputs').get(base_name)
+    if known and os.path.isfile(os.path.join(output_dir, known)):
+        return os.path.join(output_dir, known)
+    # Resolve may add a suffix to the custom name
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith(base_name) or name[len(base_name):][:1] not in ('.', '_', ' ', '-'):
+                continue
+            if name.rsplit('.', 1)[-1] in exts and entry.is_file():
+                _index_output(output_dir, base_name, entry.path)
+                return entry.path
+    return None
+
+# Exports over this size are rejected (same limit as the CEP versions)
+_MAX_EXPORT_BYTES = 1024 * 1024 * 1024
+_SIZE_LIMIT_ERROR = 'File size exceeds 1GB limit. Please use shorter in/out points or lower quality settings.'
+
+# Rough average bits per pixel per frame of each codec, for pre-render estimates
+_CODEC_BITS_PER_PIXEL = {
+    'h264': 0.4,
+    'prores_422': 2.37,
+    'prores_422hq': 3.54,
+}
+_AUDIO_BITRATES = {'pcm': 2304000, 'aac': 320000, 'mp3': 320000}
+
+# Reject up front only when clearly over; borderline renders are watched instead
+_SIZE_ESTIMATE_MARGIN = 1.5
+# Percent complete before a projected size is trusted enough to abort on
+_SIZE_PROJECTION_MIN_PERCENT = 10
+
+def _estimate_export_bytes(frame_count, fps, width=0, height=0, codec=None, audio='pcm', video_bitrate=None, render_fps=None):
+    """Estimate an export's size from its duration, resolution and codec bitrates
+
+    video_bitrate (kbps) overrides the per-codec estimate when the bitrate is fixed;
+    render_fps is the output rate when it differs from the timeline's.
+    """
+    duration = frame_count / (fps or 24.0)
+    bits = _AUDIO_BITRATES.get(audio, 0) * duration
+    if video_bitrate:
+        bits += video_bitrate * 1000.0 * duration
+    elif codec:
+        rendered_frames = duration * (render_fps or fps or 24.0)
+        bits += _CODEC_BITS_PER_PIXEL.get(codec, _CODEC_BITS_PER_PIXEL['prores_422']) * width * height * rendered_frames
+    return int(bits / 8)
+
+def _size_watch(path):
+    """Build a render watch that aborts once the output is projected to exceed the limit"""
+    def watch(percent):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        if size > _MAX_EXPORT_BYTES:
+            return _SIZE_LIMIT_ERROR
+        if percent >= _SIZE_PROJECTION_MIN_PERCENT and size * 100.0 / percent > _MAX_EXPORT_BYTES:
+            return _SIZE_LIMIT_ERROR
         return None
+    return watch
+
+def _remove_partial(path):
+    """Delete what an aborted render left behind"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+# Render cache: repeated exports of an unchanged range with the same settings reuse
+# the earlier output. Entries are evicted least-recently-used first (deleting the
+# file) once the cached outputs exceed the byte budget.
+_RENDER_CACHE_MAX_BYTES = int(os.environ.get('SYNC_RENDER_CACHE_MAX_BYTES', 10 * 1024 * 1024 * 1024))
+
+def _range_items(timeline, track_type, in_point, out_point):
+    """List (track_index, enabled, [(item, start, end)]) for the items overlapping the range
+
+    Track item lists come back in timeline order, so the first overlapping item is
+    found by bisecting on GetEnd() and the walk stops at the first item starting
+    after the range: long timelines cost a few calls per track, not one per item.
+    Walked once per request and shared by the cache key and the fast paths.
+    """
+    cache_key = (_request_serial, track_type, in_point, out_point)
+    cached = _handles.get('rangeItems')
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    tracks = []
+    for track_index in range(1, (timeline.GetTrackCount(track_type) or 0) + 1):
+        items = timeline.GetItemListInTrack(track_type, track_index) or []
+        # GetEnd() is exclusive, the in/out range inclusive
+        low, high = 0, len(items)
+        while low < high:
+            middle = (low + high) // 2
+            if items[middle].GetEnd() > in_point:
+                high = middle
+            else:
+                low = middle + 1
+        overlapping = []
+        for item in items[low:]:
+            start = item.GetStart()
+            if start > out_point:
+                break
+            overlapping.append((item, start, item.GetEnd()))
+        tracks.append((track_index, timeline.GetIsTrackEnabled(track_type, track_index), overlapping))
+    _handles['rangeItems'] = (cache_key, tracks)
+    return tracks
+
+def _grade_state(item):
+    """What scripting exposes of a clip's grade: node count, node LUTs, Fusion comps, version"""
+    state = {}
+    try:
+        state['nodes'] = item.GetNumNodes()
+        state['fusion'] = item.GetFusionCompCount()
+    except:
+        pass  # Not available on older Resolve versions
+    try:
+        version = item.GetCurrentVersion() or {}
+        state['version'] = version.get('versionName')
+    except:
+        pass
     try:
-        return project.GetCurrentTimeline()
+        # Resolve 18.5+: a LUT on the default single node is the most common grade
+        graph = item.GetNodeGraph()
+        if graph:
+            state['luts'] = [graph.GetLUT(node) or '' for node in range(1, (graph.GetNumNodes() or 0) + 1)]
     except:
+        pass
+    return state
+
+def _timeline_fingerprint(timeline, in_point, out_point):
+    """Hash the track state and items (with their grade state) that overlap the in/out range"""
+    import hashlib
+    digest = hashlib.sha1()
+    for track_type in ('video', 'audio'):
+        for track_index, enabled, items in _range_items(timeline, track_type, in_point, out_point):
+            digest.update(repr((track_type, track_index, enabled)).encode('utf-8'))
+            for item, start, end in items:
+                media_item = item.GetMediaPoolItem()
+                digest.update(json.dumps([
+                    start, end, item.GetLeftOffset(), item.GetName(),
+                    media_item.GetMediaId() if media_item else None,
+                    item.GetProperty(),
+                    _grade_state(item) if track_type == 'video' else None,
+                ], sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+def _render_cache_key(timeline, in_point, out_point, settings):
+    """Cache key for rendering the in/out range with the given settings (None if unavailable)"""
+    import hashlib
+    try:
+        key = json.dumps({
+            'timeline': _handles.get('timelineId'),
+            'items': _timeline_fingerprint(timeline, in_point, out_point),
+            'in': in_point,
+            'out': out_point,
+            'settings': settings,
+        }, sort_keys=True, default=str)
+    except Exception as e:
+        print(f"Error fingerprinting timeline: {e}", file=sys.stderr)
+        return None
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def _render_cache_get(output_dir, key, methods=None):
+    """Get a cached output path for a key, or None
+
+    methods limits the hit to outputs made a given way (e.g. ('render',) when the
+    caller turned the fast paths off); entries record 'render' unless told otherwise.
+    """
+    cache = _load_store(output_dir, 'render_cache')
+    entry = cache.get(key)
+    if not entry:
+        return None
+    if methods is not None and entry.get('method', 'render') not in methods:
+        return None
+    path = os.path.join(output_dir, entry['file'])
+    try:
+        valid = os.path.getsize(path) == entry['size']
+    except OSError:
+        valid = False
+    if not valid:
+        # Deleted or overwritten since it was cached
+        del cache[key]
+    else:
+        entry['lastUsed'] = time.time()
+    _save_store(output_dir, 'render_cache', cache)
+    return path if valid else None
+
+def _render_cache_put(output_dir, key, path, max_bytes=None, method='render'):
+    """Cache an output (made by method) and evict least-recently-used entries over the byte budget"""
+    if max_bytes is None:
+        max_bytes = _RENDER_CACHE_MAX_BYTES
+    cache = _load_store(output_dir, 'render_cache')
+    cache[key] = {'file': os.path.basename(path), 'size': os.path.getsize(path), 'lastUsed': time.time(), 'method': method}
+    total = sum(entry['size'] for entry in cache.values())
+    for old_key, entry in sorted(cache.items(), key=lambda item: item[1]['lastUsed']):
+        if total <= max_bytes:
+            break
+        if old_key == key:
+            continue
+        for evicted in (entry['file'], waveform.sidecar_path(entry['file'])):
+            try:
+                os.remove(os.path.join(output_dir, evicted))
+            except OSError:
+                pass
+        total -= entry['size']
+        del cache[old_key]
+    _save_store(output_dir, 'render_cache', cache)
+
+@tracing.phase('waveform')
+def _waveform_summary(path):
+    """Waveform summary of a WAV file (sidecar written next to it), or None"""
+    if not path or not path.lower().endswith('.wav'):
         return None
+    try:
+        summary, sidecar = waveform.summary_for(path)
+        return waveform.describe(summary, sidecar)
+    except Exception as e:
+        print(f"Error summarizing waveform for {path}: {e}", file=sys.stderr)
+        return None
+
+def _add_waveform(result, opts, path=None, default=True):
+    """Attach the waveform summary of result's WAV when opts.waveform (else default) is on"""
+    if opts.get('waveform', default):
+        summary = _waveform_summary(path or result.get('path'))
+        if summary:
+            result['waveform'] = summary
+    return result
+
+def _add_digest(result, opts, path=None, prefix=''):
+    """Attach the content digest of result's file unless opts has digest: false
+
+    With a prefix (e.g. 'audio') the keys become audioDigest / audioSeenBefore / audioUpload.
+    """
+    path = path or result.get('path')
+    if not opts.get('digest', True) or not path:
+        return result
+    try:
+        recorded = _record_output_digest(os.path.dirname(path), path)
+    except Exception as e:
+        print(f"Error hashing {path}: {e}", file=sys.stderr)
+        return result
+    for key, value in recorded.items():
+        result[prefix + key[0].upper() + key[1:] if prefix else key] = value
+    return result
 
 def export_in_out_video(opts_json):
     """Export video from timeline in/out range"""
@@ -58,134 +949,148 @@ def export_in_out_video(opts_json):
         if not timeline:
             return _respond({'ok': False, 'error': 'No active timeline'})
         
-        # Get in/out points using GetMarkInOut() which returns a dict
-        try:
-            mark_in_out = timeline.GetMarkInOut()
-            # GetMarkInOut() returns dict like {video: {in: 0, out: 134}, audio: {in: 0, out: 134}}
-            # or empty dict if not set
-            if mark_in_out and 'video' in mark_in_out:
-                video_marks = mark_in_out['video']
-                in_point = video_marks.get('in', timeline.GetStartFrame())
-                out_point = video_marks.get('out', timeline.GetEndFrame())
-            else:
-                # No marks set, use timeline range
-                in_point = timeline.GetStartFrame()
-                out_point = timeline.GetEndFrame()
-        except:
-            # Fallback to timeline range
-            in_point = timeline.GetStartFrame()
-            out_point = timeline.GetEndFrame()
+        in_point, out_point = _get_in_out_points(timeline)
         
         # Get project directory
         project = _get_project()
         if not project:
             return _respond({'ok': False, 'error': 'No active project'})
         
-        project_dir = os.path.join(os.path.expanduser('~'), 'Documents', 'sync. outputs')
-        os.makedirs(project_dir, exist_ok=True)
+        project_dir = _get_output_dir()
         
         # Generate output path with timestamp
         timestamp = int(time.time() * 1000)
-        ext = 'mp4' if codec == 'h264' else 'mov'
-        output_path = os.path.join(project_dir, f'sync_export_{timestamp}.{ext}')
+        ext = _VIDEO_CODECS.get(codec, _VIDEO_CODECS['prores_422'])[2]
         
         # Export using Resolve render API
         try:
             # GetRenderSettings() doesn't exist - build settings dict from scratch
             # Get timeline resolution and frame rate from project settings
-            try:
-                # Try to get resolution from project settings
-                width_str = project.GetSetting('timelineResolutionWidth')
-                height_str = project.GetSetting('timelineResolutionHeight')
-                fps_str = project.GetSetting('timelineFrameRate')
-                width = int(width_str) if width_str else 1920
-                height = int(height_str) if height_str else 1080
-                fps = float(fps_str) if fps_str else 24.0
-            except:
-                width = 1920
-                height = 1080
-                fps = 24.0
+            timeline_settings = _get_timeline_settings()
+            fps = timeline_settings['fps']
+            render_width = timeline_settings['width']
+            render_height = timeline_settings['height']
+            render_fps = fps
             
-            # Build render settings dictionary according to API docs
-            render_settings = {
+            # Upload profiles downscale, cap the bitrate and may drop frames
+            upload = None
+            if codec in _UPLOAD_PROFILES:
+                upload = _upload_render_settings(codec, opts, render_width, render_height, fps)
+                render_width = upload['width']
+                render_height = upload['height']
+                render_fps = upload['fps']
+                ext = upload['container']
+            
+            # Reuse an earlier render of the same unchanged range and settings
+            cache_key = None
+            if opts.get('cache', True):
+                cache_key = _render_cache_key(timeline, in_point, out_point, {
+                    'kind': 'video', 'codec': codec, 'width': render_width, 'height': render_height,
+                    'fps': render_fps, 'upload': upload,
+                })
+                # Only fastPath: true may be handed an earlier stream copy
+                cached_file = cache_key and _render_cache_get(
+                    project_dir, cache_key, None if opts.get('fastPath') else ('render',))
+                if cached_file:
+                    return _respond(_add_digest({'ok': True, 'path': cached_file, 'cached': True}, opts))
+            
+            # Reject ranges that are clearly over the size limit before rendering
+            frame_count = out_point - in_point + 1
+            if upload:
+                estimated_bytes = _estimate_export_bytes(
+                    frame_count, fps, audio=upload['audioCodec'], video_bitrate=upload['videoBitrate'])
+            else:
+                estimated_bytes = _estimate_export_bytes(
+                    frame_count, fps, render_width, render_height, codec, 'aac' if codec == 'h264' else 'pcm')
+            if estimated_bytes > _MAX_EXPORT_BYTES * _SIZE_ESTIMATE_MARGIN:
+                return _respond({'ok': False, 'error': _SIZE_LIMIT_ERROR, 'estimatedBytes': estimated_bytes})
+            
+            # Fast path (opt-in with fastPath: true): one untouched clip is trimmed out of its
+            # source without re-encoding. Scripting can't see every grade (e.g. wheels on the
+            # default node, timeline or track grades), so callers must know the shot is
+            # ungraded. Upload profiles always render, since they scale and cap the bit rate
+            if opts.get('fastPath') and not upload:
+                copy_start = time.perf_counter()
+                copied_file = _stream_copy_source_video(timeline, in_point, out_point, timeline_settings, codec,
+                                                        os.path.join(project_dir, f'sync_export_{timestamp}'))
+                if copied_file:
+                    file_size = os.path.getsize(copied_file)
+                    if file_size > _MAX_EXPORT_BYTES:
+                        os.remove(copied_file)
+                        return _respond({'ok': False, 'error': _SIZE_LIMIT_ERROR, 'estimatedBytes': estimated_bytes, 'sizeBytes': file_size})
+                    if cache_key:
+                        _render_cache_put(project_dir, cache_key, copied_file, opts.get('cacheMaxBytes'), 'streamCopy')
+                    return _respond(_add_digest({
+                        'ok': True,
+                        'path': copied_file,
+                        'method': 'streamCopy',
+                        'copyMs': int((time.perf_counter() - copy_start) * 1000),
+                        'estimatedBytes': estimated_bytes,
+                        'sizeBytes': file_size,
+                    }, opts))
+            
+            # Build render settings dictionary according to API docs. The profile part
+            # lives in a render preset; only the target, name and range change per call
+            profile_settings = {
+                'FormatWidth': render_width,
+                'FormatHeight': render_height,
+                'FrameRate': render_fps,
+                'ExportVideo': True,
+                'ExportAudio': True,
+            }
+            if upload:
+                # An integer VideoQuality is the target bit rate in kb/s
+                profile_settings['VideoQuality'] = upload['videoBitrate']
+                profile_settings['AudioCodec'] = 'lpcm' if upload['audioCodec'] == 'pcm' else 'aac'
+            call_settings = {
                 'TargetDir': project_dir,
                 'CustomName': f'sync_export_{timestamp}',
                 'MarkIn': in_point,
                 'MarkOut': out_point,
-                'FormatWidth': width,
-                'FormatHeight': height,
-                'FrameRate': fps,
-                'ExportVideo': True,
-                'ExportAudio': True,
             }
             
-            # Set codec and format using SetCurrentRenderFormatAndCodec() (REQUIRED)
-            # Note: Format and Codec are NOT supported in SetRenderSettings() dict
-            # According to API docs, SetRenderSettings() does NOT include Format/Codec keys
-            # These must be set separately using SetCurrentRenderFormatAndCodec()
-            if codec == 'h264':
-                format_str = 'mp4'
-                video_codec = 'H264'
-            elif codec == 'prores_422hq':
-                format_str = 'mov'
-                video_codec = 'Apple ProRes 422 HQ'
-            else:  # prores_422
-                format_str = 'mov'
-                video_codec = 'Apple ProRes 422'
-            
-            try:
-                result = project.SetCurrentRenderFormatAndCodec(format_str, video_codec)
-                if not result:
-                    return _respond({'ok': False, 'error': f'Failed to set render format/codec. Format: {format_str}, Codec: {video_codec}'})
-            except Exception as e:
-                return _respond({'ok': False, 'error': f'Failed to set render format/codec: {str(e)}. Format: {format_str}, Codec: {video_codec}'})
-            
-            # Apply all render settings at once
-            project.SetRenderSettings(render_settings)
-            
-            # Add render job (uses current render settings)
-            project.AddRenderJob()
+            format_error = _apply_render_profile(project, codec, profile_settings, call_settings,
+                                                 codec, upload and upload['container'])
+            if format_error:
+                return _respond({'ok': False, 'error': format_error})
             
-            # Start rendering
-            project.StartRendering()
+            # Add render job (uses current render settings) and render just that job
+            job_id = _start_render_job(project)
             
-            # Wait for render to complete (max 3 minutes)
-            max_wait = 180
-            waited = 0
-            while project.IsRenderingInProgress() and waited < max_wait:
-                import time
-                time.sleep(1)
-                waited += 1
+            # Watch the file as it grows and stop as soon as it is projected over the limit
+            partial_file = _get_job_output(project, job_id) or os.path.join(project_dir, f'sync_export_{timestamp}.{ext}')
+            render = _wait_for_render(project, job_id, frame_count, fps, _size_watch(partial_file))
+            if render['status'] != 'Complete':
+                if render['status'] == 'Aborted':
+                    _remove_partial(partial_file)
+                return _render_failure(render)
             
-            if project.IsRenderingInProgress():
-                return _respond({'ok': False, 'error': 'Render timeout'})
-            
-            # Check if file exists (Resolve may add extension or prefix)
-            found_file = None
-            if os.path.exists(output_path):
-                found_file = output_path
-            else:
-                # Try to find the rendered file
-                for file in os.listdir(project_dir):
-                    if f'sync_export_{timestamp}' in file or file.startswith('sync_export_'):
-                        full_path = os.path.join(project_dir, file)
-                        if os.path.isfile(full_path) and (full_path.endswith('.mp4') or full_path.endswith('.mov')):
-                            found_file = full_path
-                            break
+            found_file = _find_render_output(project, job_id, project_dir, f'sync_export_{timestamp}', [ext])
             
             if not found_file:
                 return _respond({'ok': False, 'error': 'Render completed but file not found'})
             
             # Check file size - reject if over 1GB (same as CEP versions)
+            file_size = None
             try:
                 file_size = os.path.getsize(found_file)
-                if file_size > 1024 * 1024 * 1024:  # 1GB
+                if file_size > _MAX_EXPORT_BYTES:
                     os.remove(found_file)
-                    return _respond({'ok': False, 'error': 'File size exceeds 1GB limit. Please use shorter in/out points or lower quality settings.'})
+                    return _respond({'ok': False, 'error': _SIZE_LIMIT_ERROR, 'estimatedBytes': estimated_bytes, 'sizeBytes': file_size})
             except:
                 pass
             
-            return _respond({'ok': True, 'path': found_file})
+            if cache_key:
+                _render_cache_put(project_dir, cache_key, found_file, opts.get('cacheMaxBytes'))
+            
+            return _respond(_add_digest({
+                'ok': True,
+                'path': found_file,
+                'method': 'render',
+                'renderMs': render['renderMs'],
+                'estimatedBytes': estimated_bytes,
+                'sizeBytes': file_size,
+            }, opts))
                 
         except Exception as e:
             return _respond({'ok': False, 'error': f'Render failed: {str(e)}'})
@@ -203,92 +1108,117 @@ def export_in_out_audio(opts_json):
         if not timeline:
             return _respond({'ok': False, 'error': 'No active timeline'})
         
-        # Get in/out points using GetMarkInOut() which returns a dict
-        try:
-            mark_in_out = timeline.GetMarkInOut()
-            # GetMarkInOut() returns dict like {video: {in: 0, out: 134}, audio: {in: 0, out: 134}}
-            # or empty dict if not set
-            if mark_in_out and 'video' in mark_in_out:
-                video_marks = mark_in_out['video']
-                in_point = video_marks.get('in', timeline.GetStartFrame())
-                out_point = video_marks.get('out', timeline.GetEndFrame())
-            else:
-                # No marks set, use timeline range
-                in_point = timeline.GetStartFrame()
-                out_point = timeline.GetEndFrame()
-        except:
-            in_point = timeline.GetStartFrame()
-            out_point = timeline.GetEndFrame()
+        in_point, out_point = _get_in_out_points(timeline)
         
         # Get project directory
         project = _get_project()
         if not project:
             return _respond({'ok': False, 'error': 'No active project'})
         
-        project_dir = os.path.join(os.path.expanduser('~'), 'Documents', 'sync. outputs')
-        os.makedirs(project_dir, exist_ok=True)
+        project_dir = _get_output_dir()
         
         # Generate output path
         timestamp = int(time.time() * 1000)
         ext = 'wav' if format_type == 'wav' else 'mp3'
-        output_path = os.path.join(project_dir, f'sync_export_audio_{timestamp}.{ext}')
         
         # Export audio (audio-only render)
         try:
+            # Reuse an earlier render of the same unchanged range and settings
+            cache_key = None
+            if opts.get('cache', True):
+                cache_key = _render_cache_key(timeline, in_point, out_point, {'kind': 'audio', 'format': format_type})
+                # Only fastPath: true may be handed an earlier direct extraction
+                cached_file = cache_key and _render_cache_get(
+                    project_dir, cache_key, None if opts.get('fastPath') else ('render',))
+                if cached_file:
+                    return _respond(_add_digest(_add_waveform({'ok': True, 'path': cached_file, 'cached': True}, opts), opts))
+            
+            # Reject ranges that are clearly over the size limit before rendering
+            frame_count = out_point - in_point + 1
+            fps = _get_timeline_settings()['fps']
+            estimated_bytes = _estimate_export_bytes(frame_count, fps, audio='pcm' if format_type == 'wav' else 'mp3')
+            if estimated_bytes > _MAX_EXPORT_BYTES * _SIZE_ESTIMATE_MARGIN:
+                return _respond({'ok': False, 'error': _SIZE_LIMIT_ERROR, 'estimatedBytes': estimated_bytes})
+            
+            # Fast path (opt-in with fastPath: true): a range inside one clip is cut from its
+            # source file. Scripting can't see clip gain, faders or Fairlight effects, so
+            # callers must know the audio is unprocessed
+            if opts.get('fastPath'):
+                extract_start = time.perf_counter()
+                output_path = os.path.join(project_dir, f'sync_export_audio_{timestamp}.{ext}')
+                method = _extract_source_audio(timeline, in_point, out_point, fps, output_path, format_type)
+                if method:
+                    file_size = os.path.getsize(output_path)
+                    if file_size > _MAX_EXPORT_BYTES:
+                        os.remove(output_path)
+                        return _respond({'ok': False, 'error': _SIZE_LIMIT_ERROR, 'estimatedBytes': estimated_bytes, 'sizeBytes': file_size})
+                    if cache_key:
+                        _render_cache_put(project_dir, cache_key, output_path, opts.get('cacheMaxBytes'), method)
+                    return _respond(_add_digest(_add_waveform({
+                        'ok': True,
+                        'path': output_path,
+                        'method': method,
+                        'extractMs': int((time.perf_counter() - extract_start) * 1000),
+                        'estimatedBytes': estimated_bytes,
+                        'sizeBytes': file_size,
+                    }, opts), opts))
+            
             # GetRenderSettings() doesn't exist - build settings dict from scratch
             # Build render settings dictionary according to API docs
-            render_settings = {
+            profile_settings = {
+                'ExportVideo': False,
+                'ExportAudio': True,
+                'AudioCodec': 'PCM' if format_type == 'wav' else 'MP3',
+            }
+            call_settings = {
                 'TargetDir': project_dir,
                 'CustomName': f'sync_export_audio_{timestamp}',
                 'MarkIn': in_point,
                 'MarkOut': out_point,
-                'ExportVideo': False,
-                'ExportAudio': True,
-                'AudioCodec': 'PCM' if format_type == 'wav' else 'MP3',
             }
             
-            # Apply render settings
-            project.SetRenderSettings(render_settings)
+            # Load the audio profile's preset and apply this call's range
+            format_error = _apply_render_profile(project, f'audio_{ext}', profile_settings, call_settings,
+                                                 audio_format=ext)
+            if format_error:
+                return _respond({'ok': False, 'error': format_error})
             
             # Add render job and start
-            project.AddRenderJob()
-            project.StartRendering()
-            
-            # Wait for render
-            max_wait = 180
-            waited = 0
-            while project.IsRenderingInProgress() and waited < max_wait:
-                time.sleep(1)
-                waited += 1
-            
-            if project.IsRenderingInProgress():
-                return _respond({'ok': False, 'error': 'Render timeout'})
-            
-            # Find rendered file
-            found_file = None
-            if os.path.exists(output_path):
-                found_file = output_path
-            else:
-                for file in os.listdir(project_dir):
-                    if f'sync_export_audio_{timestamp}' in file or (file.startswith('sync_export_audio_') and file.endswith(f'.{ext}')):
-                        full_path = os.path.join(project_dir, file)
-                        if os.path.isfile(full_path):
-                            found_file = full_path
-                            break
+            job_id = _start_render_job(project)
+            
+            partial_file = _get_job_output(project, job_id) or os.path.join(project_dir, f'sync_export_audio_{timestamp}.{ext}')
+            render = _wait_for_render(project, job_id, frame_count, fps, _size_watch(partial_file))
+            if render['status'] != 'Complete':
+                if render['status'] == 'Aborted':
+                    _remove_partial(partial_file)
+                return _render_failure(render)
+            
+            found_file = _find_render_output(project, job_id, project_dir, f'sync_export_audio_{timestamp}', [ext])
             
             if not found_file:
                 return _respond({'ok': False, 'error': 'Render completed but file not found'})
             
             # Check file size - reject if over 1GB (same as CEP versions)
+            file_size = None
             try:
                 file_size = os.path.getsize(found_file)
-                if file_size > 1024 * 1024 * 1024:  # 1GB
+                if file_size > _MAX_EXPORT_BYTES:
                     os.remove(found_file)
-                    return _respond({'ok': False, 'error': 'File size exceeds 1GB limit. Please use shorter in/out points or lower quality settings.'})
+                    return _respond({'ok': False, 'error': _SIZE_LIMIT_ERROR, 'estimatedBytes': estimated_bytes, 'sizeBytes': file_size})
             except:
                 pass
             
-            return _respond({'ok': True, 'path': found_file})
+            if cache_key:
+                _render_cache_put(project_dir, cache_key, found_file, opts.get('cacheMaxBytes'))
+            
+            return _respond(_add_digest(_add_waveform({
+                'ok': True,
+                'path': found_file,
+                'method': 'render',
+                'renderMs': render['renderMs'],
+                'estimatedBytes': estimated_bytes,
+                'sizeBytes': file_size,
+            }, opts), opts))
                 
         except Exception as e:
             return _respond({'ok': False, 'error': f'Audio render failed: {str(e)}'})
@@ -296,6 +1226,715 @@ def export_in_out_audio(opts_json):
     except Exception as e:
         return _respond({'ok': False, 'error': str(e)})
 
+_ffmpeg_path = False  # False = not looked up yet
+
+def _find_ffmpeg():
+    """Locate an ffmpeg binary (PATH first, then the usual install locations)"""
+    global _ffmpeg_path
+    if _ffmpeg_path is not False:
+        return _ffmpeg_path
+    import shutil
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        # Apps launched from the Dock/Finder don't inherit the shell's PATH
+        for candidate in ('/opt/homebrew/bin/ffmpeg', '/usr/local/bin/ffmpeg', '/usr/bin/ffmpeg'):
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                ffmpeg = candidate
+                break
+    _ffmpeg_path = ffmpeg
+    return ffmpeg
+
+@tracing.phase('ffmpeg')
+def _run_ffmpeg(args):
+    """Run ffmpeg with the given arguments; returns an error string or None"""
+    ffmpeg = _find_ffmpeg()
+    if not ffmpeg:
+        return 'ffmpeg not found'
+    import subprocess
+    try:
+        result = subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y'] + args,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+    except Exception as e:
+        return str(e)
+    if result.returncode != 0:
+        return result.stderr.decode('utf-8', 'replace').strip()[-500:] or f'ffmpeg exited with code {result.returncode}'
+    return None
+
+def _extract_audio(video_path, audio_path, format_type):
+    """Copy the audio track of a rendered file out to WAV or MP3; returns an error or None"""
+    # Same codecs the server uses for its own audio extraction
+    if format_type == 'wav':
+        codec_args = ['-acodec', 'pcm_s16le']
+    else:
+        codec_args = ['-acodec', 'libmp3lame', '-b:a', '192k']
+    error = _run_ffmpeg(['-i', video_path, '-vn', '-map', '0:a:0'] + codec_args + [audio_path])
+    if error and os.path.exists(audio_path):
+        try:
+            os.remove(audio_path)
+        except:
+            pass
+    return error
+
+# Direct extraction: when the whole range comes from one untouched clip, the span is
+# cut straight from the clip's source file instead of being rendered by Resolve
+_EXTRACT_CHUNK_FRAMES = 65536
+
+def _clips_in_range(timeline, track_type, in_point, out_point):
+    """List (item, start, end) for clips on enabled track_type tracks overlapping the range"""
+    return [clip for _, enabled, items in _range_items(timeline, track_type, in_point, out_point) if enabled
+            for clip in items]
+
+def _single_source_clip(timeline, track_type, in_point, out_point, fps, clips=None):
+    """Find the one clip supplying the whole range on track_type's enabled tracks
+
+    Returns (item, media_item, source_path, offset_seconds) or None when the range
+    is mixed (several clips or tracks), partly empty, disabled, conformed to another
+    frame rate, or the source file isn't on disk. Resolve doesn't expose clip gain or
+    effects to scripting, so the fast paths using this only run with fastPath: true.
+    """
+    if clips is None:
+        clips = _clips_in_range(timeline, track_type, in_point, out_point)
+    if len(clips) != 1:
+        return None
+    item, start, end = clips[0]
+    if start > in_point or end <= out_point:
+        return None
+    
+    try:
+        if item.GetClipEnabled() is False:
+            return None
+    except:
+        pass  # Older Resolve versions can't disable single clips
+    media_item = item.GetMediaPoolItem()
+    if not media_item:
+        return None
+    source_path = media_item.GetClipProperty('File Path') or ''
+    if not os.path.isfile(source_path):
+        return None
+    # A clip conformed to the timeline rate plays at a different speed than its source
+    if abs(parse_frame_rate(media_item.GetClipProperty('FPS'), fps) - fps) > 0.01:
+        return None
+    return item, media_item, source_path, (item.GetLeftOffset() + in_point - start) / fps
+
+def _copy_wav_span(source_path, output_path, offset_seconds, duration_seconds):
+    """Copy a span of a PCM WAV file in chunks; returns an error string or None"""
+    import wave
+    try:
+        with wave.open(source_path, 'rb') as source:
+            # Resolve renders to stereo; leave multichannel sources to the render
+            if source.getnchannels() > 2:
+                return 'source has more than two channels'
+            rate = source.getframerate()
+            start = int(round(offset_seconds * rate))
+            count = int(round(duration_seconds * rate))
+            if start < 0 or start + count > source.getnframes():
+                return 'range runs past the source file'
+            frame_bytes = source.getsampwidth() * source.getnchannels()
+            source.setpos(start)
+            with wave.open(output_path, 'wb') as output:
+                # The frame count in the header is fixed up on close
+                output.setparams(source.getparams())
+                remaining = count
+                while remaining > 0:
+                    data = source.readframes(min(_EXTRACT_CHUNK_FRAMES, remaining))
+                    if not data:
+                        break
+                    output.writeframesraw(data)
+                    remaining -= len(data) // frame_bytes
+    except (wave.Error, EOFError, OSError) as e:
+        _remove_partial(output_path)
+        return str(e)
+    return None
+
+@tracing.phase('extract')
+def _extract_source_audio(timeline, in_point, out_point, fps, output_path, format_type):
+    """Cut the range's audio straight from its single source clip
+
+    Returns the method used ("wav" for a direct PCM copy, "ffmpeg" for a trim and
+    transcode), or None when the range needs a Resolve render.
+    """
+    source = _single_source_clip(timeline, 'audio', in_point, out_point, fps)
+    if not source:
+        return None
+    item, media_item, source_path, offset_seconds = source
+    if _is_retimed(item, media_item):
+        return None
+    duration_seconds = (out_point - in_point + 1) / fps
+    
+    if format_type == 'wav' and source_path.lower().endswith(('.wav', '.wave')):
+        error = _copy_wav_span(source_path, output_path, offset_seconds, duration_seconds)
+        if not error:
+            return 'wav'
+        print(f"Direct WAV copy failed, trying ffmpeg: {error}", file=sys.stderr)
+    
+    if format_type == 'wav':
+        codec_args = ['-acodec', 'pcm_s16le']
+    else:
+        codec_args = ['-acodec', 'libmp3lame', '-b:a', '192k']
+    error = _run_ffmpeg(['-ss', f'{offset_seconds:.6f}', '-i', source_path, '-t', f'{duration_seconds:.6f}',
+                         '-vn', '-map', '0:a:0'] + codec_args + [output_path])
+    if error:
+        _remove_partial(output_path)
+        print(f"Direct audio extraction failed, rendering instead: {error}", file=sys.stderr)
+        return None
+    return 'ffmpeg'
+
+# Inspector values of a clip nobody has transformed, cropped or faded
+_UNTOUCHED_ITEM_PROPERTIES = {
+    'Pan': 0.0, 'Tilt': 0.0, 'ZoomX': 1.0, 'ZoomY': 1.0, 'RotationAngle': 0.0,
+    'AnchorPointX': 0.0, 'AnchorPointY': 0.0, 'Pitch': 0.0, 'Yaw': 0.0,
+    'CropLeft': 0.0, 'CropRight': 0.0, 'CropTop': 0.0, 'CropBottom': 0.0,
+    'FlipX': False, 'FlipY': False, 'Opacity': 100.0,
+}
+
+# Source codecs a stream copy may pass through for each export codec
+_STREAM_COPY_CODECS = {
+    'h264': ('h.264', 'h264', 'avc'),
+    'prores_422': ('prores 422',),
+    'prores_422hq': ('prores 422 hq',),
+}
+
+def _is_retimed(item, media_item):
+    """Check whether a clip plays at other than 100% speed (True when it can't be told)"""
+    # At 100% speed the trims and the timeline duration add up to the source length
+    try:
+        source_frames = int(media_item.GetClipProperty('Frames') or 0)
+        used_frames = item.GetLeftOffset() + item.GetDuration() + item.GetRightOffset()
+        return bool(source_frames) and abs(used_frames - source_frames) > 1
+    except:
+        return True
+
+def _is_untouched_video(item, media_item):
+    """Check a video clip has no transform, Fusion comp, extra grade nodes, LUT or retime"""
+    try:
+        properties = item.GetProperty() or {}
+    except:
+        return False
+    for key, untouched in _UNTOUCHED_ITEM_PROPERTIES.items():
+        value = properties.get(key)
+        if value is None:
+            continue
+        if isinstance(untouched, bool):
+            if bool(value) != untouched:
+                return False
+        elif abs(float(value) - untouched) > 1e-6:
+            return False
+    grade = _grade_state(item)
+    if (grade.get('fusion') or 0) > 0:
+        return False
+    # A fresh clip has a single (empty) corrector node
+    if (grade.get('nodes') or 0) > 1:
+        return False
+    if any(grade.get('luts') or []):
+        return False
+    return not _is_retimed(item, media_item)
+
+@tracing.phase('streamCopy')
+def _stream_copy_source_video(timeline, in_point, out_point, timeline_settings, codec, output_base):
+    """Trim the range out of its single untouched source clip without re-encoding
+
+    The source container is kept (so output_base gets the source's extension) and the
+    cut starts at the keyframe before the in point, with an edit list hiding the
+    pre-roll. Returns the output path, or None when the range needs a Resolve render.
+    """
+    fps = timeline_settings['fps']
+    video = _single_source_clip(timeline, 'video', in_point, out_point, fps)
+    if not video:
+        return None
+    item, media_item, source_path, offset_seconds = video
+    
+    ext = source_path.rsplit('.', 1)[-1].lower()
+    if ext not in ('mov', 'mp4', 'm4v'):
+        return None
+    source_codec = str(media_item.GetClipProperty('Video Codec') or '').lower()
+    if not any(name in source_codec for name in _STREAM_COPY_CODECS.get(codec, ())):
+        return None
+    if codec == 'prores_422' and 'hq' in source_codec:
+        return None
+    # A render scales to the timeline resolution; a copy can't
+    resolution = str(media_item.GetClipProperty('Resolution') or '').lower().replace(' ', '')
+    if resolution != f"{timeline_settings['width']}x{timeline_settings['height']}":
+        return None
+    if not _is_untouched_video(item, media_item):
+        return None
+    
+    # The audio must be the same clip's own audio, in sync, or absent altogether
+    audio_clips = _clips_in_range(timeline, 'audio', in_point, out_point)
+    if audio_clips:
+        audio = _single_source_clip(timeline, 'audio', in_point, out_point, fps, audio_clips)
+        if not audio or audio[2] != source_path or abs(audio[3] - offset_seconds) > 0.5 / fps:
+            return None
+        audio_args = ['-map', '0:a:0?']
+    else:
+        audio_args = ['-an']
+    
+    output_path = f'{output_base}.{ext}'
+    duration_seconds = (out_point - in_point + 1) / fps
+    error = _run_ffmpeg(['-ss', f'{offset_seconds:.6f}', '-i', source_path, '-t', f'{duration_seconds:.6f}',
+                         '-map', '0:v:0'] + audio_args + ['-c', 'copy', output_path])
+    if error:
+        _remove_partial(output_path)
+        print(f"Stream copy failed, rendering instead: {error}", file=sys.stderr)
+        return None
+    return output_path
+
+def export_in_out_combined(opts_json):
+    """Export video and a separate audio file from the in/out range with one render
+
+    The audio is split out of the rendered video locally with ffmpeg; if that is
+    not possible it falls back to a separate audio-only render.
+    """
+    try:
+        opts = json.loads(opts_json) if isinstance(opts_json, str) else opts_json
+        format_type = opts.get('format', 'wav')
+        
+        video = json.loads(export_in_out_video(opts))
+        if not video.get('ok'):
+            return _respond(video)
+        
+        ext = 'wav' if format_type == 'wav' else 'mp3'
+        audio_path = os.path.join(os.path.dirname(video['path']), f'sync_export_audio_{int(time.time() * 1000)}.{ext}')
+        extract_error = _extract_audio(video['path'], audio_path, format_type)
+        if not extract_error:
+            video.update({'audioPath': audio_path, 'audioSource': 'video'})
+            return _respond(_add_digest(_add_waveform(video, opts, audio_path), opts, audio_path, 'audio'))
+        
+        print(f"Audio split failed, rendering audio separately: {extract_error}", file=sys.stderr)
+        audio = json.loads(export_in_out_audio(opts))
+        if not audio.get('ok'):
+            return _respond({'ok': False, 'error': audio.get('error'), 'path': video['path']})
+        video.update({
+            'audioPath': audio['path'],
+            'audioSource': 'render',
+            'renderMs': video.get('renderMs', 0) + audio.get('renderMs', 0),
+        })
+        for key, audio_key in (('waveform', 'waveform'), ('digest', 'audioDigest'), ('seenBefore', 'audioSeenBefore'), ('upload', 'audioUpload')):
+            if key in audio:
+                video[audio_key] = audio[key]
+        return _respond(video)
+        
+    except Exception as e:
+        return _respond({'ok': False, 'error': str(e)})
+
+def _get_marker_ranges(timeline, color, end_frame):
+    """Build export ranges from the timeline markers of one color
+
+    A marker with a duration covers exactly that span; a point marker runs to the
+    frame before the next marker of the same color (or to end_frame).
+    """
+    start_frame = timeline.GetStartFrame()
+    markers = timeline.GetMarkers() or {}
+    frames = sorted(
+        frame for frame, marker in markers.items()
+        if not color or str(marker.get('color', '')).lower() == color.lower()
+    )
+    ranges = []
+    for index, frame in enumerate(frames):
+        in_point = start_frame + int(frame)
+        duration = int(markers[frame].get('duration') or 1)
+        if duration > 1:
+            out_point = in_point + duration - 1
+        elif index + 1 < len(frames):
+            out_point = start_frame + int(frames[index + 1]) - 1
+        else:
+            out_point = end_frame
+        ranges.append({'in': in_point, 'out': min(out_point, end_frame), 'name': markers[frame].get('name', '')})
+    return ranges
+
+def export_in_out_batch(opts_json):
+    """Export several timeline ranges as video in a single render pass
+
+    opts: {codec, ranges: [{in, out}]} with absolute timeline frames, or
+    {codec, markerColor} to export one range per marker of that color. An optional
+    name sets the output name prefix. Each output is streamed as a progress event
+    as soon as its job finishes.
+    """
+    try:
+        opts = json.loads(opts_json) if isinstance(opts_json, str) else opts_json
+        codec = opts.get('codec', 'h264')
+        
+        timeline = _get_timeline()
+        if not timeline:
+            return _respond({'ok': False, 'error': 'No active timeline'})
+        
+        project = _get_project()
+        if not project:
+            return _respond({'ok': False, 'error': 'No active project'})
+        
+        ranges = opts.get('ranges')
+        if not ranges and opts.get('markerColor') is not None:
+            ranges = _get_marker_ranges(timeline, opts.get('markerColor'), timeline.GetEndFrame())
+        if not ranges:
+            return _respond({'ok': False, 'error': 'No ranges to export'})
+        for export_range in ranges:
+            if int(export_range['out']) < int(export_range['in']):
+                return _respond({'ok': False, 'error': f"Invalid range: {export_range['in']}-{export_range['out']}"})
+        
+        project_dir = _get_output_dir()
+        base_name = opts.get('name') or f'sync_export_{int(time.time() * 1000)}'
+        ext = _VIDEO_CODECS.get(codec, _VIDEO_CODECS['prores_422'])[2]
+        timeline_settings = _get_timeline_settings()
+        shared_settings = {
+            'FormatWidth': timeline_settings['width'],
+            'FormatHeight': timeline_settings['height'],
+            'FrameRate': timeline_settings['fps'],
+            'ExportVideo': True,
+            'ExportAudio': True,
+        }
+        upload = None
+        if codec in _UPLOAD_PROFILES:
+            upload = _upload_render_settings(
+                codec, opts, timeline_settings['width'], timeline_settings['height'], timeline_settings['fps'])
+            ext = upload['container']
+            shared_settings.update({
+                'FormatWidth': upload['width'],
+                'FormatHeight': upload['height'],
+                'FrameRate': upload['fps'],
+                'VideoQuality': upload['videoBitrate'],
+                'AudioCodec': 'lpcm' if upload['audioCodec'] == 'pcm' else 'aac',
+            })
+        
+        try:
+            # Format/codec and the shared settings come from the profile's preset, once per batch
+            format_error = _apply_render_profile(project, codec, shared_settings, {'TargetDir': project_dir},
+                                                 codec, upload and upload['container'])
+            if format_error:
+                return _respond({'ok': False, 'error': format_error})
+            _clean_render_queue(project, project_dir)
+            
+            # Queue every segment, then render the whole job list in one session
+            segments = []
+            for index, export_range in enumerate(ranges):
+                in_point = int(export_range['in'])
+                out_point = int(export_range['out'])
+                name = f'{base_name}_{index + 1:03d}'
+                project.SetRenderSettings({'CustomName': name, 'MarkIn': in_point, 'MarkOut': out_point})
+                job_id = project.AddRenderJob()
+                if not job_id:
+                    return _respond({'ok': False, 'error': 'Batch export requires render job IDs (Resolve 17 or later)'})
+                segments.append({
+                    'index': index,
+                    'in': in_point,
+                    'out': out_point,
+                    'name': export_range.get('name', ''),
+                    'jobId': job_id,
+                    'customName': name,
+                })
+            
+            job_ids = [segment['jobId'] for segment in segments]
+            _track_render_jobs(project_dir, job_ids)
+            by_job = dict((segment['jobId'], segment) for segment in segments)
+            if not project.StartRendering(job_ids):
+                project.StartRendering(*job_ids)
+            
+            def on_job_done(job_id, job):
+                segment = by_job[job_id]
+                segment['ok'] = job['status'] == 'Complete'
+                if segment['ok']:
+                    segment['path'] = _find_render_output(project, job_id, project_dir, segment['customName'], [ext])
+                    if not segment['path']:
+                        segment['ok'] = False
+                        segment['error'] = 'Render completed but file not found'
+                else:
+                    segment['error'] = job.get('error') or f"Render {job['status'].lower()}"
+                _report_progress({'segment': segment['index'], 'ok': segment['ok'], 'path': segment.get('path'), 'error': segment.get('error')})
+            
+            frame_count = sum(segment['out'] - segment['in'] + 1 for segment in segments)
+            render = _wait_for_renders(project, job_ids, frame_count, timeline_settings['fps'], on_job_done)
+            
+            for segment in segments:
+                del segment['customName']
+                if 'ok' not in segment:
+                    segment['ok'] = False
+                    segment['error'] = 'Render cancelled' if render['status'] == 'Cancelled' else 'Render timeout'
+            
+            return _respond({
+                'ok': all(segment['ok'] for segment in segments),
+                'segments': segments,
+                'renderMs': render['renderMs'],
+                'cancelled': render['status'] == 'Cancelled',
+            })
+                
+        except Exception as e:
+            return _respond({'ok': False, 'error': f'Batch render failed: {str(e)}'})
+            
+    except Exception as e:
+        return _respond({'ok': False, 'error': str(e)})
+
+def _concat_segments(paths, output_path):
+    """Join rendered segments into one file without re-encoding; returns an error or None"""
+    list_path = f'{output_path}.txt'
+    try:
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for path in paths:
+                # ffmpeg concat list quoting: close the quote, escape, reopen
+                f.write("file '%s'\n" % path.replace("'", "'\\''"))
+        return _run_ffmpeg(['-f', 'concat', '-safe', '0', '-i', list_path, '-map', '0', '-c', 'copy', output_path])
+    finally:
+        _remove_partial(list_path)
+
+# Each segment is its own render job, so very short segments swamp the render queue
+_MAX_SEGMENTS = 500
+
+def export_in_out_segmented(opts_json):
+    """Export the in/out range as fixed-length chunks that can be uploaded as they finish
+
+    opts: {codec, segmentSeconds (default 10, must be > 0), concat (default false)}. At
+    most _MAX_SEGMENTS chunks are made. The chunks are queued as separate render jobs and each is streamed as a progress event as soon
+    as it finishes. The response lists the chunks and the path of a JSON manifest
+    describing them; with concat it also joins them into one file without re-encoding.
+    """
+    try:
+        opts = json.loads(opts_json) if isinstance(opts_json, str) else opts_json
+        codec = opts.get('codec', 'h264')
+        
+        timeline = _get_timeline()
+        if not timeline:
+            return _respond({'ok': False, 'error': 'No active timeline'})
+        
+        try:
+            segment_seconds = float(opts.get('segmentSeconds', 10))
+        except (TypeError, ValueError):
+            segment_seconds = 0
+        if not segment_seconds > 0:
+            return _respond({'ok': False, 'error': f"Invalid segmentSeconds: {opts.get('segmentSeconds')}"})
+        
+        in_point, out_point = _get_in_out_points(timeline)
+        fps = _get_timeline_settings()['fps']
+        segment_frames = max(1, int(round(segment_seconds * fps)))
+        segment_count = (out_point - in_point + segment_frames) // segment_frames
+        if segment_count > _MAX_SEGMENTS:
+            return _respond({
+                'ok': False,
+                'error': f'{segment_count} segments is over the limit of {_MAX_SEGMENTS}; use longer segments',
+                'segmentCount': segment_count,
+            })
+        ranges = [
+            {'in': start, 'out': min(start + segment_frames - 1, out_point)}
+            for start in range(in_point, out_point + 1, segment_frames)
+        ]
+        
+        base_name = f'sync_export_{int(time.time() * 1000)}'
+        batch_opts = dict(opts)
+        batch_opts.update({'ranges': ranges, 'name': base_name})
+        batch_opts.pop('markerColor', None)
+        batch = json.loads(export_in_out_batch(batch_opts))
+        if not batch.get('segments'):
+            return _respond(batch)
+        
+        project_dir = _get_output_dir()
+        manifest = {
+            'codec': codec,
+            'fps': fps,
+            'in': in_point,
+            'out': out_point,
+            'segmentFrames': segment_frames,
+            'segments': [
+                {'index': segment['index'], 'in': segment['in'], 'out': segment['out'], 'path': segment.get('path')}
+                for segment in batch['segments']
+            ],
+        }
+        manifest_path = os.path.join(project_dir, f'{base_name}_manifest.json')
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
+        result = {
+            'ok': batch['ok'],
+            'segments': batch['segments'],
+            'manifestPath': manifest_path,
+            'renderMs': batch.get('renderMs'),
+        }
+        if batch.get('cancelled'):
+            result['cancelled'] = True
+        
+        if batch['ok'] and opts.get('concat'):
+            paths = [segment['path'] for segment in batch['segments']]
+            concat_path = os.path.join(project_dir, f'{base_name}{os.path.splitext(paths[0])[1]}')
+            concat_error = _concat_segments(paths, concat_path)
+            if concat_error:
+                result['concatError'] = concat_error
+            else:
+                result['path'] = concat_path
+        
+        return _respond(result)
+        
+    except Exception as e:
+        return _respond({'ok': False, 'error': str(e)})
+
+# Media pool index, kept per project in _handles: 'mediaIndex' maps normalized file
+# paths to MediaPoolItems (from each clip's "File Path" property) and 'folderIndex'
+# maps bin paths like "sync/2026-10/outputs" to Folders ('' is the root folder).
+def _media_key(file_path):
+    return os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
+
+def _bin_key(bin_path):
+    """Normalize a slash-separated bin path ('' is the root folder)"""
+    return '/'.join(name for name in str(bin_path or '').replace('\\', '/').split('/') if name)
+
+@tracing.phase('mediaIndex')
+def _get_media_index():
+    """Get the file path -> MediaPoolItem index, walking the media pool on first use"""
+    index = _handles.get('mediaIndex')
+    if index is not None:
+        return index
+    root_folder = _get_root_folder()
+    if not root_folder:
+        return {}
+    index = {}
+    # Scripting can't ask a clip for its bin, so remember where each one was found
+    bins = _handles['mediaBins'] = {}
+    folder_index = _handles.setdefault('folderIndex', {})
+    folder_index[''] = root_folder
+    pending = [('', root_folder)]
+    while pending:
+        folder_path, folder = pending.pop()
+        for clip in folder.GetClipList() or []:
+            try:
+                clip_path = clip.GetClipProperty('File Path')
+            except:
+                continue
+            if clip_path:
+                key = _media_key(clip_path)
+                if key not in index:
+                    index[key] = clip
+                    bins[key] = folder_path
+        for subfolder in folder.GetSubFolderList() or []:
+            name = subfolder.GetName()
+            subfolder_path = f'{folder_path}/{name}' if folder_path else name
+            folder_index.setdefault(subfolder_path, subfolder)
+            pending.append((subfolder_path, subfolder))
+    _handles['mediaIndex'] = index
+    return index
+
+def _find_media_item(file_path):
+    """Get the MediaPoolItem already imported from file_path, or None"""
+    key = _media_key(file_path)
+    index = _get_media_index()
+    clip = index.get(key)
+    if clip is None:
+        return None
+    # The clip may have been removed from the pool since it was indexed
+    try:
+        if _media_key(clip.GetClipProperty('File Path') or '') == key:
+            return clip
+    except:
+        pass
+    del index[key]
+    return None
+
+def _index_media_item(file_path, clip, bin_path=None):
+    """Record a newly imported clip (and its bin, when known) in the media index"""
+    if _handles.get('mediaIndex') is not None:
+        _handles['mediaIndex'][_media_key(file_path)] = clip
+        if bin_path is not None:
+            _handles.setdefault('mediaBins', {})[_media_key(file_path)] = _bin_key(bin_path)
+
+def _move_to_bin(clips, bin_path, target_bin):
+    """Move reused clips ({file_path: clip}) that sit in another bin into target_bin
+
+    Returns {file_path: (bin path the clip is now in or None if unknown, moved)}.
+    """
+    bin_path = _bin_key(bin_path)
+    bins = _handles.setdefault('mediaBins', {})
+    placed = {}
+    to_move = {}
+    for file_path, clip in clips.items():
+        current = bins.get(_media_key(file_path))
+        if current == bin_path:
+            placed[file_path] = (current, False)
+        else:
+            to_move[file_path] = clip
+    if not to_move:
+        return placed
+    try:
+        moved = bool(_get_media_pool().MoveClips(list(to_move.values()), target_bin))
+    except Exception as e:
+        # MediaPool.MoveClips() needs Resolve 18 or later
+        print(f"Error moving clips to bin {bin_path!r}: {e}", file=sys.stderr)
+        moved = False
+    for file_path in to_move:
+        key = _media_key(file_path)
+        if moved:
+            bins[key] = bin_path
+        placed[file_path] = (bins.get(key), moved)
+    return placed
+
+def _get_bin(bin_path, create=True):
+    """Get (optionally creating) a bin by slash-separated path from the root folder"""
+    folder_index = _handles.setdefault('folderIndex', {})
+    if '' not in folder_index:
+        root_folder = _get_root_folder()
+        if not root_folder:
+            return None
+        folder_index[''] = root_folder
+    names = [name for name in str(bin_path).replace('\\', '/').split('/') if name]
+    folder_path = ''
+    for name in names:
+        parent_path = folder_path
+        folder_path = f'{parent_path}/{name}' if parent_path else name
+        if folder_path in folder_index:
+            continue
+        parent = folder_index[parent_path]
+        # Learn all children of this parent at once so siblings are lookups later
+        for subfolder in parent.GetSubFolderList() or []:
+            sibling_name = subfolder.GetName()
+            folder_index.setdefault(f'{parent_path}/{sibling_name}' if parent_path else sibling_name, subfolder)
+        if folder_path not in folder_index:
+            if not create:
+                return None
+            media_pool = _get_media_pool()
+            subfolder = media_pool.AddSubFolder(parent, name) if media_pool else None
+            if not subfolder:
+                return None
+            folder_index[folder_path] = subfolder
+    return folder_index[folder_path]
+
+@tracing.phase('import')
+def _import_media_many(file_paths, folder, bin_path=None):
+    """Import files into folder with one ImportMedia call, reusing clips already in the pool
+
+    bin_path is folder's slash-separated path, recorded for the imported clips.
+    Returns {file_path: (clip or None, reused)}.
+    """
+    results = {}
+    to_import = []
+    for file_path in file_paths:
+        clip = _find_media_item(file_path)
+        if clip:
+            results[file_path] = (clip, True)
+        elif file_path not in to_import:
+            to_import.append(file_path)
+    if not to_import:
+        return results
+
+    media_pool = _get_media_pool()
+    # ImportMedia() only takes a list of paths, not a folder parameter
+    # Set current folder first, then import
+    media_pool.SetCurrentFolder(folder)
+    imported = media_pool.ImportMedia(to_import) or []
+    if len(to_import) == 1 and len(imported) == 1:
+        by_key = {_media_key(to_import[0]): imported[0]}
+    else:
+        # ImportMedia skips files it can't read, so match clips back by path
+        by_key = {}
+        for clip in imported:
+            try:
+                by_key[_media_key(clip.GetClipProperty('File Path') or '')] = clip
+            except:
+                continue
+    for file_path in to_import:
+        clip = by_key.get(_media_key(file_path))
+        if clip:
+            _index_media_item(file_path, clip, bin_path)
+        results[file_path] = (clip, False)
+    return results
+
+def _import_media(file_path, folder, bin_path=None):
+    """Import file_path into folder unless the pool already has it; returns (clip, reused)"""
+    return _import_media_many([file_path], folder, bin_path)[file_path]
+
 def insert_file_at_playhead(path_json):
     """Insert media file at playhead position"""
     try:
@@ -309,30 +1948,10 @@ def insert_file_at_playhead(path_json):
         if not timeline:
             return _respond({'ok': False, 'error': 'No active timeline'})
         
-        # Get playhead position (returns timecode string like "01:00:00:00")
+        # Get playhead position (returns timecode string like "01:00:00:00", or
+        # "01:00:00;00" for drop-frame timelines) and convert it to a timeline frame
         try:
-            playhead_tc = timeline.GetCurrentTimecode()
-            # Convert timecode to frame number for insertion
-            # Timecode format: HH:MM:SS:FF
-            try:
-                parts = playhead_tc.split(':')
-                if len(parts) == 4:
-                    hours, minutes, seconds, frames = map(int, parts)
-                    # Get frame rate from project settings (timelineFrameRate is a project setting)
-                    project = _get_project()
-                    if project:
-                        try:
-                            fps_str = project.GetSetting('timelineFrameRate')
-                            fps = float(fps_str) if fps_str else 24.0
-                        except:
-                            fps = 24.0
-                    else:
-                        fps = 24.0
-                    playhead_frame = int((hours * 3600 + minutes * 60 + seconds) * fps + frames)
-                else:
-                    playhead_frame = timeline.GetStartFrame()
-            except:
-                playhead_frame = timeline.GetStartFrame()
+            playhead_frame = _get_timecode_rate().to_frames(timeline.GetCurrentTimecode())
         except:
             playhead_frame = timeline.GetStartFrame()
         
@@ -341,59 +1960,49 @@ def insert_file_at_playhead(path_json):
         if not project:
             return _respond({'ok': False, 'error': 'No active project'})
         
-        media_pool = project.GetMediaPool()
+        media_pool = _get_media_pool()
         if not media_pool:
             return _respond({'ok': False, 'error': 'Media pool not available'})
         
-        # Import file to root folder
-        # ImportMedia() only takes a list of paths, not a folder parameter
-        # Set current folder first, then import
-        root_bin = media_pool.GetRootFolder()
-        media_pool.SetCurrentFolder(root_bin)
-        import_result = media_pool.ImportMedia([file_path])
-        
-        # Get the imported clip - ImportMedia returns a list of clips
-        imported_clip = None
-        if import_result:
-            if isinstance(import_result, list) and len(import_result) > 0:
-                imported_clip = import_result[0]
-            else:
-                # Try to find by scanning root folder
-                clips = root_bin.GetClipList()
-                file_name = os.path.basename(file_path)
-                for clip in clips:
-                    try:
-                        clip_name = clip.GetName()
-                        if clip_name == file_name or file_path in str(clip.GetMediaId()):
-                            imported_clip = clip
-                            break
-                    except:
-                        continue
+        # Reuse the clip if this file is already in the pool, else import to root folder
+        imported_clip, _ = _import_media(file_path, _get_root_folder())
         
         if not imported_clip:
             return _respond({'ok': False, 'error': 'Failed to import or find clip'})
         
-        # Insert at playhead - use AppendToTimeline (most reliable method)
+        # Insert at playhead - MediaPool.AppendToTimeline() with a clipInfo dict places the
+        # clip at recordFrame on the chosen track, so no track item list is needed
+        track_index = int(payload.get('trackIndex', 1)) if isinstance(payload, dict) else 1
+        media_type = payload.get('mediaType') if isinstance(payload, dict) else None
         try:
-            # Append clip to timeline (adds to end)
-            timeline.AppendToTimeline([imported_clip])
-            
-            # Get the track count and find the clip we just added
-            video_track_count = timeline.GetTrackCount("video")
-            if video_track_count > 0:
-                # Get clips in first video track
-                track_items = timeline.GetItemListInTrack("video", 1)
-                if track_items:
-                    # The last item should be the one we just added
-                    last_item = track_items[-1]
-                    # Note: TimelineItem.SetProperty() does NOT support "Start" property
-                    # According to API docs (lines 803-900), supported properties are:
-                    # Pan, Tilt, ZoomX, ZoomY, RotationAngle, AnchorPointX, etc. - but NOT "Start"
-                    # There's GetStart() to read position, but no SetStart() or SetProperty("Start")
-                    # The clip will be appended to the end of the timeline
-                    # There's no direct API way to set clip position - user can manually move it
-            
-            return _respond({'ok': True, 'message': 'Inserted at playhead'})
+            clip_info = {
+                'mediaPoolItem': imported_clip,
+                'recordFrame': playhead_frame,
+                'trackIndex': track_index,
+            }
+            if media_type in ('video', 'audio'):
+                clip_info['mediaType'] = 1 if media_type == 'video' else 2
+            try:
+                frames = int(imported_clip.GetClipProperty('Frames') or 0)
+            except:
+                frames = 0
+            if frames > 0:
+                clip_info['startFrame'] = 0
+                clip_info['endFrame'] = frames - 1
+            
+            opts = payload if isinstance(payload, dict) else {}
+            if media_pool.AppendToTimeline([clip_info]):
+                return _respond(_add_waveform({
+                    'ok': True,
+                    'message': 'Inserted at playhead',
+                    'recordFrame': playhead_frame,
+                    'trackIndex': track_index,
+                }, opts, file_path, default=False))
+            
+            # Older Resolve versions ignore clipInfo placement - append to the end instead
+            if not media_pool.AppendToTimeline([imported_clip]):
+                return _respond({'ok': False, 'error': 'Failed to insert clip'})
+            return _respond(_add_waveform({'ok': True, 'message': 'Appended to end of timeline', 'appended': True}, opts, file_path, default=False))
         except Exception as e:
             return _respond({'ok': False, 'error': f'Failed to insert clip: {str(e)}'})
             
@@ -414,54 +2023,153 @@ def import_file_to_bin(payload_json):
         if not project:
             return _respond({'ok': False, 'error': 'No active project'})
         
-        media_pool = project.GetMediaPool()
+        media_pool = _get_media_pool()
         if not media_pool:
             return _respond({'ok': False, 'error': 'Media pool not available'})
         
-        # Get or create bin
-        root_bin = media_pool.GetRootFolder()
-        target_bin = root_bin
-        
-        if bin_name:
-            # Find or create bin
-            bins = root_bin.GetSubFolderList()
-            for bin in bins:
-                if bin.GetName() == bin_name:
-                    target_bin = bin
-                    break
-            else:
-                # Create new bin
-                target_bin = media_pool.AddSubFolder(root_bin, bin_name)
-        
-        # Import file to target bin
-        # ImportMedia() only takes a list of paths, not a folder parameter
-        # Set current folder first, then import
-        media_pool.SetCurrentFolder(target_bin)
-        import_result = media_pool.ImportMedia([file_path])
-        
-        # Verify import succeeded
-        if import_result:
-            return _respond({'ok': True})
-        else:
-            # Check if file already exists in bin
-            clips = target_bin.GetClipList()
-            file_name = os.path.basename(file_path)
-            for clip in clips:
-                try:
-                    if clip.GetName() == file_name:
-                        return _respond({'ok': True, 'reused': True})
-                except:
-                    continue
+        # Get or create bin (binName may be a nested path like "sync/2026-10/outputs")
+        target_bin = _get_bin(bin_name) if bin_name else _get_root_folder()
+        if not target_bin:
+            return _respond({'ok': False, 'error': f'Failed to create bin: {bin_name}'})
+        
+        clip, reused = _import_media(file_path, target_bin, bin_name)
+        if not clip:
             return _respond({'ok': False, 'error': 'Import failed'})
+        if reused:
+            # The pool already had the file: move it into the requested bin, and report
+            # the bin it is actually in if that isn't possible
+            actual_bin, moved = _move_to_bin({file_path: clip}, bin_name, target_bin)[file_path]
+            result = {'ok': True, 'reused': True, 'moved': moved, 'binName': actual_bin}
+            return _respond(_add_waveform(result, payload, file_path, default=False))
+        return _respond(_add_waveform({'ok': True}, payload, file_path, default=False))
+        
+    except Exception as e:
+        return _respond({'ok': False, 'error': str(e)})
+
+def import_files_to_bins(payload_json):
+    """Import many files, with one ImportMedia call per target bin
+
+    payload: {files: [{path, binName?}], binName?}; a file without its own binName
+    goes to the top-level binName (or the root folder). Returns a result per file
+    with status "imported", "reused" (moved into the bin from wherever it was) or
+    "failed".
+    """
+    try:
+        payload = json.loads(payload_json) if isinstance(payload_json, str) else payload_json
+        default_bin = payload.get('binName', '')
+        
+        project = _get_project()
+        if not project:
+            return _respond({'ok': False, 'error': 'No active project'})
+        
+        if not _get_media_pool():
+            return _respond({'ok': False, 'error': 'Media pool not available'})
+        
+        results = []
+        by_bin = {}
+        for entry in payload.get('files', []):
+            if isinstance(entry, str):
+                entry = {'path': entry}
+            result = {'path': entry.get('path', ''), 'binName': entry.get('binName', default_bin)}
+            results.append(result)
+            if not result['path'] or not os.path.exists(result['path']):
+                result.update({'status': 'failed', 'error': 'File not found'})
+                continue
+            by_bin.setdefault(result['binName'], []).append(result)
+        
+        for bin_name, bin_results in by_bin.items():
+            target_bin = _get_bin(bin_name) if bin_name else _get_root_folder()
+            if not target_bin:
+                for result in bin_results:
+                    result.update({'status': 'failed', 'error': f'Failed to create bin: {bin_name}'})
+                continue
+            try:
+                imported = _import_media_many([result['path'] for result in bin_results], target_bin, bin_name)
+                # Clips the pool already had are moved into this bin with one call
+                placed = _move_to_bin({path: clip for path, (clip, reused) in imported.items() if clip and reused},
+                                      bin_name, target_bin)
+            except Exception as e:
+                for result in bin_results:
+                    result.update({'status': 'failed', 'error': str(e)})
+                continue
+            for result in bin_results:
+                clip, reused = imported[result['path']]
+                if not clip:
+                    result.update({'status': 'failed', 'error': 'Import failed'})
+                else:
+                    result['status'] = 'reused' if reused else 'imported'
+                    if reused:
+                        # binName is where the clip actually is, should the move have failed
+                        result['binName'], result['moved'] = placed[result['path']]
+                    _add_waveform(result, payload, default=False)
+        
+        return _respond({
+            'ok': all(result['status'] != 'failed' for result in results),
+            'results': results,
+        })
         
     except Exception as e:
         return _respond({'ok': False, 'error': str(e)})
 
-def get_project_dir():
+def record_upload(payload_json):
+    """Remember the upload of an output so identical exports can skip uploading
+
+    payload: {path, url, expiresIn? (seconds), expiresAt? (epoch seconds)}
+    """
+    try:
+        payload = json.loads(payload_json) if isinstance(payload_json, str) else payload_json
+        file_path = payload.get('path', '')
+        url = payload.get('url', '')
+        if not file_path or not os.path.exists(file_path):
+            return _respond({'ok': False, 'error': 'File not found'})
+        if not url:
+            return _respond({'ok': False, 'error': 'Upload URL required'})
+        
+        output_dir = os.path.dirname(file_path)
+        index = _load_store(output_dir, 'digests')
+        digest, stat = _file_digest(index, file_path)
+        entry = index.pop(digest, None) or {}
+        entry.update({'file': os.path.basename(file_path), 'size': stat.st_size, 'mtime': stat.st_mtime, 'lastSeen': time.time()})
+        entry['upload'] = {
+            'url': url,
+            'expiresAt': payload.get('expiresAt') or time.time() + payload.get('expiresIn', _UPLOAD_DEFAULT_TTL),
+        }
+        index[digest] = entry
+        _save_digests(output_dir, index)
+        return _respond({'ok': True, 'digest': digest})
+        
+    except Exception as e:
+        return _respond({'ok': False, 'error': str(e)})
+
+def cancel_render(payload_json=None):
+    """Cancel the render an export is waiting on, or a sync render another process started
+
+    Renders the user started (e.g. from the Deliver page) are never stopped.
+    """
+    try:
+        if _render_active.is_set():
+            # The export's monitor stops the render and reports it as cancelled
+            _render_cancel.set()
+            return _respond({'ok': True, 'cancelled': True})
+        
+        # Export running in another process - stop the render only if it is one sync queued
+        project = _get_project()
+        if not project:
+            return _respond({'ok': False, 'error': 'No active project'})
+        tracked = _load_store(_get_output_dir(), 'render_jobs')
+        if not any(_get_render_status(project, job_id).get('JobStatus') == 'Rendering' for job_id in tracked):
+            return _respond({'ok': True, 'cancelled': False})
+        project.StopRendering()
+        return _respond({'ok': True, 'cancelled': True})
+        
+    except Exception as e:
+        return _respond({'ok': False, 'error': str(e)})
+
+def get_project_dir(payload_json=None):
     """Get current project directory"""
     try:
         # Check if Resolve is initialized
-        if not resolve:
+        if not _get_resolve():
             return _respond({'ok': False, 'error': 'Resolve API not initialized. Make sure DaVinci Resolve is running.'})
         
         project = _get_project()
@@ -512,6 +2220,8 @@ def reveal_file(path_json):
         if not os.path.exists(file_path):
             return _respond({'ok': False, 'error': 'File not found'})
         
+        import platform
+        import subprocess
         if platform.system() == 'Darwin':  # macOS
             subprocess.run(['open', '-R', file_path])
         elif platform.system() == 'Windows':
@@ -524,64 +2234,362 @@ def reveal_file(path_json):
     except Exception as e:
         return _respond({'ok': False, 'error': str(e)})
 
-def diag_in_out():
-    """Get diagnostic info about timeline"""
+# Fields getTimelineState can return; markers are opt-in as busy timelines carry many
+_TIMELINE_STATE_FIELDS = ('project', 'timeline', 'range', 'markInOut', 'playhead', 'fps', 'resolution', 'tracks', 'markers')
+_TIMELINE_STATE_DEFAULT = _TIMELINE_STATE_FIELDS[:-1]
+
+def get_timeline_state(payload_json=None):
+    """Get a snapshot of the project and timeline state in one call
+
+    payload: {fields: [...]} picks any of project, timeline, range, markInOut, playhead,
+    fps, resolution, tracks and markers (default: everything but markers). Each value
+    is read from Resolve at most once, and project/timeline identity and settings come
+    from the handle cache, so a panel refresh costs only the fields it asks for.
+    """
     try:
+        payload = json.loads(payload_json or '{}') if isinstance(payload_json, str) else (payload_json or {})
+        fields = payload.get('fields') or _TIMELINE_STATE_DEFAULT
+        if isinstance(fields, str):
+            fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in _TIMELINE_STATE_FIELDS]
+        if unknown:
+            return _respond({'ok': False, 'error': f'Unknown fields: {", ".join(unknown)}'})
+        fields = set(fields)
+        
         # Check if Resolve is initialized
-        if not resolve:
+        if not _get_resolve():
             return _respond({'ok': False, 'error': 'Resolve API not initialized. Make sure DaVinci Resolve is running.'})
         
-        timeline = _get_timeline()
         project = _get_project()
-        
-        info = {
+        timeline = _get_timeline() if project else None
+        state = {
             'ok': True,
-            'hasTimeline': timeline is not None,
             'hasProject': project is not None,
+            'hasTimeline': timeline is not None,
         }
         
-        if timeline:
-            try:
-            info['timelineName'] = timeline.GetName()
-            except:
-                info['timelineName'] = None
-            try:
-            info['startFrame'] = timeline.GetStartFrame()
-            except:
-                info['startFrame'] = None
-            try:
-            info['endFrame'] = timeline.GetEndFrame()
-            except:
-                info['endFrame'] = None
-            try:
-                info['currentTimecode'] = timeline.GetCurrentTimecode()
-            except:
-                info['currentTimecode'] = None
+        if 'project' in fields:
+            # _get_project() already read the name as the project's identity
+            state['projectName'] = _handles.get('projectId')
+        if not timeline:
+            return _respond(state)
+        
+        def read(method, *args):
             try:
-                mark_in_out = timeline.GetMarkInOut()
-                # GetMarkInOut() returns dict like {video: {in: 0, out: 134}, audio: {in: 0, out: 134}}
-                if mark_in_out and 'video' in mark_in_out:
-                    video_marks = mark_in_out['video']
-                    info['markIn'] = video_marks.get('in')
-                    info['markOut'] = video_marks.get('out')
-                else:
-                    info['markIn'] = None
-                    info['markOut'] = None
+                return getattr(timeline, method)(*args)
             except:
-                info['markIn'] = None
-                info['markOut'] = None
+                return None
+        
+        if 'timeline' in fields:
+            state['timelineName'] = read('GetName')
+            state['timelineId'] = _handles.get('timelineId')
+        
+        start_frame = read('GetStartFrame') if fields & {'range', 'markers'} else None
+        if 'range' in fields:
+            state['startFrame'] = start_frame
+            state['endFrame'] = read('GetEndFrame')
+        
+        if 'markInOut' in fields:
+            # GetMarkInOut() returns dict like {video: {in: 0, out: 134}, audio: {in: 0, out: 134}}
+            mark_in_out = read('GetMarkInOut') or {}
+            video_marks = mark_in_out.get('video') or {}
+            audio_marks = mark_in_out.get('audio') or {}
+            state['markIn'] = video_marks.get('in')
+            state['markOut'] = video_marks.get('out')
+            state['audioMarkIn'] = audio_marks.get('in')
+            state['audioMarkOut'] = audio_marks.get('out')
+        
+        if fields & {'fps', 'resolution', 'playhead', 'markers'}:
+            settings = _get_timeline_settings()
+            if 'fps' in fields:
+                state['fps'] = settings['fps']
+                state['dropFrame'] = settings['dropFrame']
+            if 'resolution' in fields:
+                state['width'] = settings['width']
+                state['height'] = settings['height']
         
-        if project:
+        if 'playhead' in fields:
+            playhead_tc = read('GetCurrentTimecode')
+            state['currentTimecode'] = playhead_tc
             try:
-            info['projectName'] = project.GetName()
+                state['playheadFrame'] = _get_timecode_rate().to_frames(playhead_tc)
             except:
-                info['projectName'] = None
+                state['playheadFrame'] = None
+        
+        if 'tracks' in fields:
+            state['trackCounts'] = {
+                track_type: read('GetTrackCount', track_type)
+                for track_type in ('video', 'audio', 'subtitle')
+            }
         
-        return _respond(info)
+        if 'markers' in fields:
+            # Marker keys are frame offsets from the timeline start
+            markers = read('GetMarkers') or {}
+            offsets = sorted(markers, key=float)
+            start = start_frame or 0
+            timecodes = _get_timecode_rate().to_timecodes(offsets, start)
+            state['markers'] = [
+                {
+                    'frame': start + int(offset),
+                    'timecode': timecode,
+                    'color': markers[offset].get('color'),
+                    'name': markers[offset].get('name', ''),
+                    'note': markers[offset].get('note', ''),
+                    'duration': markers[offset].get('duration', 1),
+                }
+                for offset, timecode in zip(offsets, timecodes)
+            ]
+        
+        return _respond(state)
         
     except Exception as e:
         return _respond({'ok': False, 'error': str(e)})
 
+functions = {
+    'exportInOutVideo': export_in_out_video,
+    'exportInOutAudio': export_in_out_audio,
+    'exportInOutBatch': export_in_out_batch,
+    'exportInOutCombined': export_in_out_combined,
+    'exportInOutSegmented': export_in_out_segmented,
+    'insertFileAtPlayhead': insert_file_at_playhead,
+    'importFileToBin': import_file_to_bin,
+    'importFilesToBins': import_files_to_bins,
+    'getProjectDir': get_project_dir,
+    'revealFile': reveal_file,
+    'getTimelineState': get_timeline_state,
+    # Older panels still ask for diagInOut; the default snapshot carries all of its keys
+    'diagInOut': get_timeline_state,
+    'cancelRender': cancel_render,
+    'recordUpload': record_upload,
+}
+
+# Add a timings block to every response, not just those whose payload asks for it
+_TIMINGS_ALWAYS = os.environ.get('SYNC_RESOLVE_TIMINGS') == '1'
+
+# Module startup is charged to the first request this process serves
+_startup_pending = True
+
+def _wants_timings(payload):
+    """Check whether a request asked for a timings block ({"timings": true})"""
+    if _TIMINGS_ALWAYS:
+        return True
+    if isinstance(payload, str):
+        if '"timings"' not in payload:
+            return False
+        try:
+            payload = json.loads(payload)
+        except:
+            return False
+    return isinstance(payload, dict) and bool(payload.get('timings'))
+
+def _call_function(func_name, payload):
+    """Run one function from the functions table and return its JSON response"""
+    global _startup_pending
+    if func_name not in functions:
+        return _respond({'ok': False, 'error': f'Unknown function: {func_name}'})
+    _begin_request()
+    tracing.begin_request(func_name)
+    if _startup_pending:
+        _startup_pending = False
+        tracing.record_phase('startup', _MODULE_START, _MODULE_READY)
+    exporting = func_name in _EXPORT_FUNCTIONS
+    if exporting:
+        # A cancel left over from an earlier export must not stop this one
+        _render_cancel.clear()
+        _render_active.set()
+    try:
+        result = functions[func_name](payload)
+    except Exception as e:
+        result = _respond({'ok': False, 'error': str(e)})
+    finally:
+        if exporting:
+            _render_active.clear()
+    timings = tracing.end_request()
+    if timings and _wants_timings(payload):
+        try:
+            data = json.loads(result)
+            if isinstance(data, dict):
+                data['timings'] = timings
+                result = _respond(data)
+        except:
+            pass
+    return result
+
+def _server_line(req_id, result):
+    """Wrap a function's JSON response in a server-mode response line"""
+    # Functions already return serialized JSON, so splice it in rather than re-encoding
+    return f'{{"id": {json.dumps(req_id)}, "result": {result}}}\n'
+
+def _utf8_stdin():
+    """Read stdin as UTF-8 (what the backend writes), not the locale encoding
+
+    Windows pipes default to the ANSI code page, which garbles non-ASCII paths.
+    """
+    try:
+        sys.stdin.reconfigure(encoding='utf-8')
+    except:
+        pass  # Python < 3.7
+
+def serve():
+    """Run as a long-lived worker speaking newline-delimited JSON over stdin/stdout
+
+    Each request line is {"id": ..., "fn": "<function name>", "payload": {...}} and is
+    answered with exactly one line {"id": ..., "result": {...}}. Long calls may first
+    emit {"id": ..., "event": "progress", "data": {...}} lines. Requests run one at a
+    time, except cancelRender, which is handled as soon as it arrives so it can stop
+    a render in progress. Send {"fn": "shutdown"} or close stdin to exit.
+    """
+    global _progress_sink
+    import queue
+
+    _utf8_stdin()
+    out = sys.stdout
+    # Keep stray prints from the API functions off the protocol channel
+    sys.stdout = sys.stderr
+    out_lock = threading.Lock()
+    pending = queue.Queue()
+    current = {'id': None}
+
+    def write(line):
+        with out_lock:
+            out.write(line)
+            out.flush()
+
+    def send_progress(data):
+        event = {'id': current['id'], 'event': 'progress', 'data': data}
+        write(json.dumps(event) + '\n')
+
+    def read_requests():
+        while True:
+            line = sys.stdin.readline()
+            if not line:
+                pending.put(None)
+                return
+            line = line.strip()
+            if not line:
+                continue
+
+            req_id = None
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('request must be a JSON object')
+                req_id = request.get('id')
+                func_name = request.get('fn', '')
+                payload = request.get('payload', {})
+            except Exception as e:
+                write(_server_line(req_id, _respond({'ok': False, 'error': f'Invalid request: {str(e)}'})))
+                continue
+
+            if func_name == 'cancelRender' and _render_active.is_set():
+                write(_server_line(req_id, cancel_render(payload)))
+                continue
+            pending.put((req_id, func_name, payload))
+            if func_name == 'shutdown':
+                return
+
+    _progress_sink = send_progress
+    reader = threading.Thread(target=read_requests, daemon=True)
+    reader.start()
+
+    while True:
+        request = pending.get()
+        if request is None:
+            break
+        req_id, func_name, payload = request
+        if func_name == 'shutdown':
+            write(_server_line(req_id, _respond({'ok': True})))
+            break
+        current['id'] = req_id
+        if func_name == 'ping':
+            result = _respond({'ok': True, 'connected': resolve is not None})
+        else:
+            result = _call_function(func_name, payload)
+        write(_server_line(req_id, result))
+
+# Watch mode (--watch): the timeline state is sampled inside this one process and only
+# changes are printed, backing off while nothing changes
+_WATCH_FIELDS = ('project', 'timeline', 'range', 'markInOut', 'playhead', 'fps')
+_WATCH_INTERVAL = 0.25
+_WATCH_MAX_INTERVAL = 2.0
+
+def watch(options_json=None):
+    """Print the timeline state as NDJSON, then a line for each change
+
+    options: {fields, intervalMs, maxIntervalMs}; fields as for getTimelineState
+    (default: project, timeline, range, markInOut, playhead, fps). The first line is
+    {"event": "state", "data": {...}}, later ones {"event": "change", "changed": {...}}
+    with only the values that changed ("removed" lists keys that went away, e.g. when
+    the timeline is closed). Sampling starts every intervalMs and backs off x1.5 up to
+    maxIntervalMs while nothing changes. Exits when stdin is closed.
+    """
+    options = json.loads(options_json or '{}') if isinstance(options_json, str) else (options_json or {})
+    fields = options.get('fields') or list(_WATCH_FIELDS)
+    interval_min = max(0.02, float(options.get('intervalMs', _WATCH_INTERVAL * 1000)) / 1000)
+    interval_max = max(interval_min, float(options.get('maxIntervalMs', _WATCH_MAX_INTERVAL * 1000)) / 1000)
+    
+    _utf8_stdin()
+    out = sys.stdout
+    # Keep stray prints from the API functions off the protocol channel
+    sys.stdout = sys.stderr
+    stop = threading.Event()
+    
+    def wait_for_stdin_close():
+        while sys.stdin.readline():
+            pass
+        stop.set()
+    
+    threading.Thread(target=wait_for_stdin_close, daemon=True).start()
+    
+    previous = None
+    interval = interval_min
+    while not stop.is_set():
+        _begin_request()
+        try:
+            state = json.loads(get_timeline_state({'fields': fields}))
+        except Exception as e:
+            state = {'ok': False, 'error': str(e)}
+        
+        line = None
+        if previous is None:
+            line = {'event': 'state', 'data': state}
+        else:
+            changed = dict((key, value) for key, value in state.items() if key not in previous or previous[key] != value)
+            removed = [key for key in previous if key not in state]
+            if changed or removed:
+                line = {'event': 'change', 'changed': changed}
+                if removed:
+                    line['removed'] = removed
+        previous = state
+        
+        if line:
+            line['ts'] = int(time.time() * 1000)
+            out.write(json.dumps(line) + '\n')
+            out.flush()
+            interval = interval_min
+        else:
+            interval = min(interval * 1.5, interval_max)
+        stop.wait(interval)
+
+def profile_startup():
+    """Report module import and Resolve connection phases separately (in ms)"""
+    module_ms = (_MODULE_READY - _MODULE_START) * 1000
+    start = time.perf_counter()
+    connected = _connect_resolve() is not None
+    total_ms = module_ms + (time.perf_counter() - start) * 1000
+    return _respond({
+        'ok': True,
+        'connected': connected,
+        'timings': {
+            'moduleImportMs': round(module_ms, 3),
+            'resolveImportMs': _startup_timings.get('resolveImportMs'),
+            'resolveConnectMs': _startup_timings.get('resolveConnectMs'),
+            'totalMs': round(total_ms, 3),
+        },
+    })
+
+_MODULE_READY = time.perf_counter()
+
 # Main entry point for command-line usage
 if __name__ == '__main__':
     if len(sys.argv) < 2:
@@ -591,20 +2599,24 @@ if __name__ == '__main__':
     func_name = sys.argv[1]
     payload = sys.argv[2] if len(sys.argv) > 2 else '{}'
     
-    functions = {
-        'exportInOutVideo': export_in_out_video,
-        'exportInOutAudio': export_in_out_audio,
-        'insertFileAtPlayhead': insert_file_at_playhead,
-        'importFileToBin': import_file_to_bin,
-        'getProjectDir': get_project_dir,
-        'revealFile': reveal_file,
-        'diagInOut': diag_in_out,
-    }
+    if func_name == '--server':
+        serve()
+        sys.exit(0)
+    
+    if func_name == '--watch':
+        watch(payload)
+        sys.exit(0)
+    
+    if func_name == '--profile-startup':
+        print(profile_startup())
+        sys.exit(0)
     
     if func_name in functions:
-        result = functions[func_name](payload)
-        print(result)
+        # One-shot callers get progress events as JSON lines on stderr (stdout is the result)
+        def _print_progress(data):
+            print(json.dumps({'event': 'progress', 'data': data}), file=sys.stderr, flush=True)
+        _progress_sink = _print_progress
+        print(_call_function(func_name, payload))
     else:
         print(_respond({'ok': False, 'error': f'Unknown function: {func_name}'}))
         sys.exit(1)
-
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Timecode <-> frame conversion for Resolve timelines
+Handles fractional rates (23.976, 29.97, 59.94), drop-frame timecode and timeline
+start offsets. Frame numbers are absolute timeline frames, the same numbering as
+Timeline.GetStartFrame() / GetEndFrame() and the render MarkIn / MarkOut settings.
+"""
+
+from functools import lru_cache
+
+
+def parse_frame_rate(value, default=24.0):
+    """Parse a Resolve frame rate setting such as "23.976", "29.97 DF" or 25"""
+    try:
+        return float(str(value).split()[0])
+    except (ValueError, IndexError):
+        return default
+
+
+class TimecodeRate:
+    """Frame <-> timecode conversion for one frame rate, with precomputed constants"""
+
+    __slots__ = ('fps', 'nominal', 'drop_frame', 'drop', 'frames_per_minute',
+                 'frames_per_10_minutes', 'frames_per_day')
+
+    def __init__(self, fps, drop_frame=False):
+        self.fps = float(fps)
+        # Timecode counts in whole frames: 23.976 counts like 24, 29.97 like 30
+        self.nominal = max(1, int(round(self.fps)))
+        # Drop frame only exists for the NTSC rates (29.97, 59.94)
+        self.drop_frame = bool(drop_frame) and self.nominal % 30 == 0 and abs(self.fps - self.nominal) > 0.001
+        # Frame numbers skipped at the start of each minute except every tenth
+        self.drop = self.nominal // 15 if self.drop_frame else 0
+        self.frames_per_minute = self.nominal * 60 - self.drop
+        self.frames_per_10_minutes = self.frames_per_minute * 10 + self.drop
+        self.frames_per_day = self.frames_per_10_minutes * 6 * 24
+
+    def to_frames(self, timecode):
+        """Convert "HH:MM:SS:FF" (or "HH:MM:SS;FF") to an absolute frame number"""
+        parts = str(timecode).strip().replace(';', ':').replace('.', ':').split(':')
+        if len(parts) != 4:
+            raise ValueError(f'Invalid timecode: {timecode}')
+        hours, minutes, seconds, frames = (int(part) for part in parts)
+        total_minutes = hours * 60 + minutes
+        frame = (total_minutes * 60 + seconds) * self.nominal + frames
+        if self.drop:
+            frame -= self.drop * (total_minutes - total_minutes // 10)
+        return frame
+
+    def to_timecode(self, frame):
+        """Convert an absolute frame number to timecode (";" before frames when drop frame)"""
+        frame = int(frame) % self.frames_per_day
+        if self.drop:
+            tens, remainder = divmod(frame, self.frames_per_10_minutes)
+            frame += self.drop * 9 * tens
+            if remainder > self.drop:
+                frame += self.drop * ((remainder - self.drop) // self.frames_per_minute)
+        nominal = self.nominal
+        frames = frame % nominal
+        seconds = (frame // nominal) % 60
+        minutes = (frame // (nominal * 60)) % 60
+        hours = frame // (nominal * 3600)
+        separator = ';' if self.drop_frame else ':'
+        return f'{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{frames:02d}'
+
+    def to_frames_many(self, timecodes):
+        """Convert a list of timecodes to absolute frame numbers"""
+        to_frames = self.to_frames
+        return [to_frames(timecode) for timecode in timecodes]
+
+    def to_timecodes(self, frames, start_frame=0):
+        """Convert a list of frames to timecodes
+
+        start_frame is added first, so timeline-relative offsets (e.g. the keys of
+        Timeline.GetMarkers()) can be passed with the timeline's GetStartFrame().
+        """
+        to_timecode = self.to_timecode
+        return [to_timecode(start_frame + int(frame)) for frame in frames]
+
+    def frames_to_seconds(self, frames):
+        """Real-time duration of a frame count"""
+        return frames / self.fps
+
+
+@lru_cache(maxsize=16)
+def get_rate(fps, drop_frame=False):
+    """Get the (memoized) TimecodeRate for a frame rate"""
+    return TimecodeRate(fps, drop_frame)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Timing instrumentation for the Resolve bridge
+Every Resolve scripting call is an RPC into the Resolve process. Handles wrapped with
+traced() record each call, and functions decorated with phase() record the bridge's
+own phases (connect, settings, render wait, output lookup, import). Totals for the
+current request are returned by end_request(); when SYNC_RESOLVE_TRACE_DIR is set,
+each request is also written there as a Chrome trace / Perfetto JSON file.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Opt-in trace file directory (open the files in ui.perfetto.dev or chrome://tracing)
+TRACE_DIR = os.environ.get('SYNC_RESOLVE_TRACE_DIR') or None
+
+# Long renders poll status many times; cap the events kept for one trace file
+_TRACE_MAX_EVENTS = 100000
+
+_PRIMITIVES = (str, bytes, int, float, bool, type(None))
+
+# The request being recorded (None between requests)
+_request = None
+_trace_serial = 0
+
+
+class TracedHandle:
+    """Proxy for a Resolve scripting object that times every method call"""
+
+    __slots__ = ('_target',)
+
+    def __init__(self, target):
+        object.__setattr__(self, '_target', target)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return traced(attr(*_unwrap(args), **_unwrap(kwargs)))
+            finally:
+                _record('rpc', name, start, time.perf_counter())
+        return call
+
+    def __bool__(self):
+        return bool(self._target)
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f'TracedHandle({self._target!r})'
+
+
+def traced(value):
+    """Wrap Resolve objects (also inside returned lists/dicts) so their calls are timed"""
+    if isinstance(value, _PRIMITIVES) or isinstance(value, TracedHandle):
+        return value
+    if isinstance(value, list):
+        return [traced(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(traced(item) for item in value)
+    if isinstance(value, dict):
+        return {key: traced(item) for key, item in value.items()}
+    return TracedHandle(value)
+
+
+def _unwrap(value):
+    """Hand the real Resolve objects back to the API (e.g. clipInfo['mediaPoolItem'])"""
+    if isinstance(value, TracedHandle):
+        return value._target
+    if isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+def phase(name):
+    """Decorator recording each call of the function as a named phase"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record('phase', name, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+def record_phase(name, start, end):
+    """Record a phase measured elsewhere (perf_counter start/end)"""
+    _record('phase', name, start, end)
+
+
+def _record(kind, name, start, end):
+    request = _request
+    if request is None:
+        return
+    totals = request['phases'] if kind == 'phase' else request['calls']
+    elapsed_ms = (end - start) * 1000
+    entry = totals.get(name)
+    if entry is None:
+        totals[name] = [1, elapsed_ms]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed_ms
+    events = request['events']
+    if events is not None and len(events) < _TRACE_MAX_EVENTS:
+        events.append((kind, name, start, end, threading.get_ident()))
+
+
+def begin_request(name):
+    """Start recording a request"""
+    global _request
+    _request = {
+        'name': name,
+        'start': time.perf_counter(),
+        'wallStart': time.time(),
+        'phases': {},
+        'calls': {},
+        'events': [] if TRACE_DIR else None,
+    }
+
+
+def end_request():
+    """Stop recording and return the request's timings block (None if not recording)"""
+    global _request
+    request, _request = _request, None
+    if request is None:
+        return None
+    end = time.perf_counter()
+
+    calls = request['calls']
+    timings = {
+        'totalMs': round((end - request['start']) * 1000, 3),
+        'phases': {
+            name: {'count': count, 'ms': round(ms, 3)}
+            for name, (count, ms) in request['phases'].items()
+        },
+        'rpc': {
+            'count': sum(count for count, _ in calls.values()),
+            'ms': round(sum(ms for _, ms in calls.values()), 3),
+            'calls': {
+                name: {'count': count, 'ms': round(ms, 3)}
+                for name, (count, ms) in sorted(calls.items(), key=lambda item: -item[1][1])
+            },
+        },
+    }
+    if request['events'] is not None:
+        trace_file = _write_trace(request, end)
+        if trace_file:
+            timings['traceFile'] = trace_file
+    return timings
+
+
+def _write_trace(request, end):
+    """Write one request as a Chrome trace file; returns its path"""
+    global _trace_serial
+    _trace_serial += 1
+    pid = os.getpid()
+    origin = request['start']
+    wall_us = request['wallStart'] * 1e6
+
+    def event(category, name, start, stop, tid):
+        return {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round(wall_us + (start - origin) * 1e6, 1),
+            'dur': round((stop - start) * 1e6, 1),
+            'pid': pid,
+            'tid': tid,
+        }
+
+    events = [event('request', request['name'], origin, end, threading.get_ident())]
+    events.extend(event(kind, name, start, stop, tid) for kind, name, start, stop, tid in request['events'])
+    trace = {
+        'traceEvents': events,
+        'displayTimeUnit': 'ms',
+        'otherData': {'function': request['name']},
+    }
+
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(request['wallStart']))
+    path = os.path.join(TRACE_DIR, f'resolve-{stamp}-{pid}-{_trace_serial}-{request["name"]}.json')
+    try:
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(trace, f)
+    except Exception as e:
+        print(f"Error writing trace file: {e}", file=sys.stderr)
+        return None
+    return path
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Multi-resolution waveform summaries for WAV files
+Each zoom level holds, per bucket of frames, the min and max sample and the RMS over
+all channels, scaled to 16-bit. The finest level is computed from the PCM data (with
+NumPy over a memory-mapped view when NumPy is available, else in chunks with audioop
+or plain Python), coarser levels from the level below, so memory use stays flat for
+hour-long files.
+
+The summary is stored next to the audio as "<file>.peaks" (all little-endian):
+
+    header  4s magic "SYPK", H version, H channels, I sample rate, Q frames, H levels, H reserved
+    levels  per level: I bucket frames, I bucket count
+    data    per level: bucket count x h min, then h max, then H rms
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+SIDECAR_SUFFIX = '.peaks'
+
+_MAGIC = b'SYPK'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHIQHH')
+_LEVEL = struct.Struct('<II')
+
+# Finest bucket (~21 ms at 48 kHz) and the zoom factor between levels
+BASE_BUCKET_FRAMES = 1024
+LEVEL_FACTOR = 4
+LEVEL_COUNT = 4
+
+# Buckets processed per block, bounding memory use whatever the file length
+_BLOCK_BUCKETS = 1024
+
+# Largest level returned inline with a result; finer levels stay in the sidecar
+PREVIEW_MAX_BUCKETS = 2048
+
+# Without NumPy or audioop (e.g. float WAVs, or Python 3.13+) samples are summed in
+# plain Python at several seconds per minute of audio; only short files are worth it
+PURE_PYTHON_MAX_SECONDS = 20
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_numpy = False  # False = not imported yet
+_audioop = False
+
+
+def _get_numpy():
+    """Import NumPy on first use (None when it isn't installed)"""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def _get_audioop():
+    """Import audioop on first use (None from Python 3.13, where it was removed)"""
+    global _audioop
+    if _audioop is False:
+        import warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            try:
+                import audioop
+                _audioop = audioop
+            except ImportError:
+                _audioop = None
+    return _audioop
+
+
+def read_wav_info(path):
+    """Read the format and data chunk position of a WAV file"""
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError('not a WAV file')
+        info = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError('no data chunk')
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                audio_format, channels, rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    # The real format is the first two bytes of the sub-format GUID
+                    audio_format = struct.unpack('<H', fmt[24:26])[0]
+                info = {'format': audio_format, 'channels': channels, 'sampleRate': rate, 'bits': bits}
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if not info:
+                    raise ValueError('data chunk before fmt chunk')
+                frame_bytes = info['channels'] * (info['bits'] // 8)
+                # Renders still being written (or >4 GB) can carry a bogus size
+                data_size = min(chunk_size, os.path.getsize(path) - f.tell())
+                info.update({'dataOffset': f.tell(), 'frames': data_size // frame_bytes if frame_bytes else 0})
+                break
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+    supported = ((_WAVE_FORMAT_PCM, (8, 16, 24, 32)), (_WAVE_FORMAT_FLOAT, (32,)))
+    if not any(info['format'] == fmt and info['bits'] in bits for fmt, bits in supported):
+        raise ValueError(f"unsupported WAV format {info['format']} ({info['bits']}-bit)")
+    if not info['channels']:
+        raise ValueError('WAV file has no channels')
+    return info
+
+
+def _clip16(value):
+    return -32768 if value < -32768 else 32767 if value > 32767 else int(value)
+
+
+def _finest_level_numpy(numpy, path, info, bucket_frames):
+    """Min/max/sum of squares per bucket, vectorized over a memory-mapped view"""
+    channels = info['channels']
+    frames = info['frames']
+    width = info['bits'] // 8
+    if info['bits'] == 24:
+        raw = numpy.memmap(path, dtype=numpy.uint8, mode='r', offset=info['dataOffset'], shape=(frames * channels * 3,))
+    else:
+        dtype = {8: '<u1', 16: '<i2', 32: '<f4' if info['format'] == _WAVE_FORMAT_FLOAT else '<i4'}[info['bits']]
+        raw = numpy.memmap(path, dtype=dtype, mode='r', offset=info['dataOffset'], shape=(frames * channels,))
+
+    bucket_samples = bucket_frames * channels
+    bucket_count = (frames + bucket_frames - 1) // bucket_frames
+    mins = numpy.empty(bucket_count, dtype=numpy.int16)
+    maxs = numpy.empty(bucket_count, dtype=numpy.int16)
+    sums = numpy.empty(bucket_count, dtype=numpy.float64)
+    counts = numpy.empty(bucket_count, dtype=numpy.int64)
+
+    for first in range(0, bucket_count, _BLOCK_BUCKETS):
+        last = min(bucket_count, first + _BLOCK_BUCKETS)
+        start = first * bucket_samples
+        stop = min(frames * channels, last * bucket_samples)
+        if info['bits'] == 24:
+            block = raw[start * 3:stop * 3].reshape(-1, 3).astype(numpy.int32)
+            block = block[:, 0] | (block[:, 1] << 8) | (block[:, 2] << 16)
+            block = ((block ^ 0x800000) - 0x800000) / 256.0
+        elif info['bits'] == 8:
+            block = (raw[start:stop].astype(numpy.float32) - 128.0) * 256.0
+        elif info['bits'] == 16:
+            block = raw[start:stop].astype(numpy.float32)
+        elif info['format'] == _WAVE_FORMAT_FLOAT:
+            block = raw[start:stop] * 32767.0
+        else:
+            block = raw[start:stop] / 65536.0
+        block = numpy.clip(block, -32768, 32767)
+
+        # Full buckets reshape into rows; a short last bucket is handled on its own
+        full = (stop - start) // bucket_samples
+        if full:
+            rows = block[:full * bucket_samples].reshape(full, bucket_samples)
+            mins[first:first + full] = rows.min(axis=1)
+            maxs[first:first + full] = rows.max(axis=1)
+            sums[first:first + full] = numpy.einsum('ij,ij->i', rows, rows, dtype=numpy.float64)
+            counts[first:first + full] = bucket_samples
+        if first + full < last:
+            tail = block[full * bucket_samples:]
+            mins[first + full] = tail.min()
+            maxs[first + full] = tail.max()
+            sums[first + full] = float(numpy.dot(tail.astype(numpy.float64), tail))
+            counts[first + full] = len(tail)
+    del raw
+    return mins.tolist(), maxs.tolist(), sums.tolist(), counts.tolist()
+
+
+def _decode_block(data, info):
+    """Decode little-endian PCM bytes into 16-bit scaled sample values (stdlib)"""
+    bits = info['bits']
+    if bits == 16:
+        samples = array('h')
+        samples.frombytes(data)
+    elif bits == 32:
+        samples = array('f' if info['format'] == _WAVE_FORMAT_FLOAT else 'i')
+        samples.frombytes(data)
+    elif bits == 8:
+        return [(byte - 128) * 256 for byte in data]
+    else:
+        # 24-bit: keep the top two bytes of each sample
+        return [int.from_bytes(data[i + 1:i + 3], 'little', signed=True) for i in range(0, len(data) - 2, 3)]
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    if bits == 32:
+        scale = 32767.0 if info['format'] == _WAVE_FORMAT_FLOAT else 1 / 65536.0
+        return [_clip16(value * scale) for value in samples]
+    return samples
+
+
+def _finest_level_stdlib(path, info, bucket_frames):
+    """Min/max/sum of squares per bucket, reading one block of buckets at a time"""
+    import operator
+    channels = info['channels']
+    frame_bytes = channels * (info['bits'] // 8)
+    bucket_samples = bucket_frames * channels
+    remaining = info['frames'] * frame_bytes
+    audioop = _get_audioop()
+    mins, maxs, sums, counts = [], [], [], []
+    with open(path, 'rb') as f:
+        f.seek(info['dataOffset'])
+        while remaining > 0:
+            data = f.read(min(remaining, _BLOCK_BUCKETS * bucket_frames * frame_bytes))
+            if not data:
+                break
+            remaining -= len(data)
+            if audioop is not None and info['format'] == _WAVE_FORMAT_PCM:
+                # audioop works in C on raw bytes: convert to 16-bit, then min/max/RMS per bucket
+                if info['bits'] == 8:
+                    data = audioop.bias(data, 1, 128)  # unsigned -> signed
+                if info['bits'] != 16:
+                    data = audioop.lin2lin(data, info['bits'] // 8, 2)
+                if sys.byteorder == 'big':
+                    data = audioop.byteswap(data, 2)
+                bucket_bytes = bucket_samples * 2
+                for start in range(0, len(data), bucket_bytes):
+                    bucket = data[start:start + bucket_bytes]
+                    low, high = audioop.minmax(bucket, 2)
+                    count = len(bucket) // 2
+                    mins.append(low)
+                    maxs.append(high)
+                    sums.append(float(audioop.rms(bucket, 2)) ** 2 * count)
+                    counts.append(count)
+                continue
+            samples = _decode_block(data, info)
+            for start in range(0, len(samples), bucket_samples):
+                bucket = samples[start:start + bucket_samples]
+                mins.append(int(min(bucket)))
+                maxs.append(int(max(bucket)))
+                sums.append(float(sum(map(operator.mul, bucket, bucket))))
+                counts.append(len(bucket))
+    return mins, maxs, sums, counts
+
+
+def summarize(path, base_bucket_frames=BASE_BUCKET_FRAMES, factor=LEVEL_FACTOR, level_count=LEVEL_COUNT):
+    """Compute the waveform summary of a WAV file"""
+    info = read_wav_info(path)
+    numpy = _get_numpy()
+    if numpy is not None and info['frames']:
+        mins, maxs, sums, counts = _finest_level_numpy(numpy, path, info, base_bucket_frames)
+    else:
+        accelerated = _get_audioop() is not None and info['format'] == _WAVE_FORMAT_PCM
+        if not accelerated and info['frames'] > PURE_PYTHON_MAX_SECONDS * info['sampleRate']:
+            raise ValueError(f'summarizing over {PURE_PYTHON_MAX_SECONDS} s of audio needs NumPy or audioop')
+        mins, maxs, sums, counts = _finest_level_stdlib(path, info, base_bucket_frames)
+
+    levels = []
+    bucket_frames = base_bucket_frames
+    for index in range(level_count):
+        if index:
+            # Each coarser bucket covers `factor` buckets of the level below
+            groups = range(0, len(mins), factor)
+            mins = [min(mins[i:i + factor]) for i in groups]
+            maxs = [max(maxs[i:i + factor]) for i in groups]
+            sums = [sum(sums[i:i + factor]) for i in groups]
+            counts = [sum(counts[i:i + factor]) for i in groups]
+            bucket_frames *= factor
+        levels.append({
+            'bucketFrames': bucket_frames,
+            'min': array('h', mins),
+            'max': array('h', maxs),
+            'rms': array('H', (min(32767, int(round((total / count) ** 0.5))) if count else 0
+                               for total, count in zip(sums, counts))),
+        })
+    return {
+        'channels': info['channels'],
+        'sampleRate': info['sampleRate'],
+        'frames': info['frames'],
+        'levels': levels,
+    }
+
+
+def sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def write_sidecar(summary, path):
+    """Write a summary to path (atomically)"""
+    levels = summary['levels']
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, summary['channels'], summary['sampleRate'],
+                             summary['frames'], len(levels), 0))
+        for level in levels:
+            f.write(_LEVEL.pack(level['bucketFrames'], len(level['min'])))
+        for level in levels:
+            for values in (level['min'], level['max'], level['rms']):
+                if sys.byteorder == 'big':
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                f.write(values.tobytes())
+    os.replace(temp_path, path)
+
+
+def read_sidecar(path):
+    """Read a summary written by write_sidecar()"""
+    with open(path, 'rb') as f:
+        magic, version, channels, rate, frames, level_count, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('not a waveform summary')
+        shapes = [_LEVEL.unpack(f.read(_LEVEL.size)) for _ in range(level_count)]
+        levels = []
+        for bucket_frames, bucket_count in shapes:
+            level = {'bucketFrames': bucket_frames}
+            for key, typecode in (('min', 'h'), ('max', 'h'), ('rms', 'H')):
+                values = array(typecode)
+                values.frombytes(f.read(bucket_count * values.itemsize))
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                level[key] = values
+            levels.append(level)
+    return {'channels': channels, 'sampleRate': rate, 'frames': frames, 'levels': levels}
+
+
+def summary_for(path):
+    """Get the summary of a WAV, reusing its sidecar when it is newer than the audio
+
+    Returns (summary, sidecar path).
+    """
+    sidecar = sidecar_path(path)
+    try:
+        if os.path.getmtime(sidecar) >= os.path.getmtime(path):
+            return read_sidecar(sidecar), sidecar
+    except (OSError, ValueError, struct.error):
+        pass
+    summary = summarize(path)
+    write_sidecar(summary, sidecar)
+    return summary, sidecar
+
+
+def describe(summary, sidecar, preview_max_buckets=PREVIEW_MAX_BUCKETS):
+    """JSON-friendly description: the level layout plus the largest level that fits inline"""
+    levels = summary['levels']
+    preview = None
+    for level in levels:
+        if len(level['min']) <= preview_max_buckets:
+            preview = level
+            break
+    if preview is None:
+        preview = levels[-1]
+    return {
+        'path': sidecar,
+        'channels': summary['channels'],
+        'sampleRate': summary['sampleRate'],
+        'frames': summary['frames'],
+        'levels': [{'bucketFrames': level['bucketFrames'], 'buckets': len(level['min'])} for level in levels],
+        'preview': {
+            'bucketFrames': preview['bucketFrames'],
+            'min': preview['min'].tolist(),
+            'max': preview['max'].tolist(),
+            'rms': preview['rms'].tolist(),
+        },
+    }
@@ -11,12 +11,20 @@ declare global {
       getProjectDir: () => Promise<any>;
       exportInOutVideo: (opts?: any) => Promise<any>;
       exportInOutAudio: (opts?: any) => Promise<any>;
+      exportInOutCombined: (opts?: any) => Promise<any>;
+      exportInOutBatch: (opts?: any) => Promise<any>;
+      exportInOutSegmented: (opts?: any) => Promise<any>;
+      getRenderSegments: (exportId?: string, since?: number) => Promise<any>;
       importFileToBin: (fsPath: string, binName?: string) => Promise<any>;
+      importFilesToBins: (files: Array<string | { path: string; binName?: string }>, binName?: string) => Promise<any>;
       importIntoBin: (jobId: string) => Promise<any>;
       insertFileAtPlayhead: (fsPath: string) => Promise<any>;
       insertAtPlayhead: (jobId: string) => Promise<any>;
       revealFile: (fsPath: string) => Promise<any>;
+      recordUpload: (fsPath: string, url: string) => Promise<any>;
       diagInOut: () => Promise<any>;
+      getTimelineState: (fields?: string[]) => Promise<any>;
+      watchTimelineState: (since?: number) => Promise<any>;
       diag: () => Promise<any>;
       showFileDialog: (options: any) => Promise<any>;
       ensureDir: (dirPath: string) => Promise<any>;
@@ -240,12 +248,26 @@ declare global {
     getProjectDir: function(): Promise<any> { return jsonGet('/nle/getProjectDir'); },
     exportInOutVideo: function(opts?: any): Promise<any> { return jsonPost('/nle/exportInOutVideo', opts || {}); },
     exportInOutAudio: function(opts?: any): Promise<any> { return jsonPost('/nle/exportInOutAudio', opts || {}); },
+    exportInOutCombined: function(opts?: any): Promise<any> { return jsonPost('/nle/exportInOutCombined', opts || {}); },
+    exportInOutBatch: function(opts?: any): Promise<any> { return jsonPost('/nle/exportInOutBatch', opts || {}); },
+    exportInOutSegmented: function(opts?: any): Promise<any> { return jsonPost('/nle/exportInOutSegmented', opts || {}); },
+    getRenderSegments: function(exportId?: string, since?: number): Promise<any> {
+      const params = new URLSearchParams();
+      if (exportId) params.set('exportId', exportId);
+      if (since !== undefined) params.set('since', String(since));
+      const query = params.toString();
+      return jsonGet('/nle/renderSegments' + (query ? '?' + query : ''));
+    },
     importFileToBin: function(fsPath: string, binName?: string): Promise<any> { return jsonPost('/nle/importFileToBin', { path: fsPath, binName: binName || '' }); },
+    importFilesToBins: function(files: Array<string | { path: string; binName?: string }>, binName?: string): Promise<any> { return jsonPost('/nle/importFilesToBins', { files, binName: binName || '' }); },
     importIntoBin: function(jobId: string): Promise<any> { return jsonPost('/nle/importIntoBin', { jobId }); },
     insertFileAtPlayhead: function(fsPath: string): Promise<any> { return jsonPost('/nle/insertFileAtPlayhead', { path: fsPath }); },
     insertAtPlayhead: function(jobId: string): Promise<any> { return jsonPost('/nle/insertAtPlayhead', { jobId }); },
     revealFile: function(fsPath: string): Promise<any> { return jsonPost('/nle/revealFile', { path: fsPath }); },
+    recordUpload: function(fsPath: string, url: string): Promise<any> { return jsonPost('/nle/recordUpload', { path: fsPath, url }); },
     diagInOut: function(): Promise<any> { return jsonGet('/nle/diagInOut'); },
+    watchTimelineState: function(since?: number): Promise<any> { return jsonGet('/nle/timelineState' + (since !== undefined ? '?since=' + since : '')); },
+    getTimelineState: function(fields?: string[]): Promise<any> { return jsonGet('/nle/getTimelineState' + (fields && fields.length ? '?fields=' + encodeURIComponent(fields.join(',')) : '')); },
     diag: function(): Promise<any> { return jsonGet('/nle/diag'); },
     showFileDialog: function(options: any): Promise<any> { return jsonPost('/nle/showFileDialog', options); },
     ensureDir: function(dirPath: string): Promise<any> { return jsonPost('/nle/ensureDir', { path: dirPath }); },